@@ -0,0 +1,93 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('firstname', sa.String(), nullable=False),
+        sa.Column('lastname', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_id', 'user', ['id'])
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+    op.create_table(
+        'category',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('category_name', sa.String(), nullable=False),
+        sa.Column('color', sa.String(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_category_id', 'category', ['id'])
+
+    op.create_table(
+        'events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id']),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_events_id', 'events', ['id'])
+
+    op.create_table(
+        'bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('time_slot_id', sa.Integer(), nullable=False),
+        sa.Column('booked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('modified_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.ForeignKeyConstraint(['time_slot_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_bookings_id', 'bookings', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_id', table_name='bookings')
+    op.drop_table('bookings')
+    op.drop_index('ix_events_id', table_name='events')
+    op.drop_table('events')
+    op.drop_index('ix_category_id', table_name='category')
+    op.drop_table('category')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_index('ix_user_id', table_name='user')
+    op.drop_table('user')
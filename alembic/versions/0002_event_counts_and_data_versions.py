@@ -0,0 +1,49 @@
+"""category event counts and data versions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'category',
+        sa.Column('event_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE category
+        SET event_count = counts.event_count
+        FROM (
+            SELECT category_id, count(*) AS event_count
+            FROM events
+            GROUP BY category_id
+        ) AS counts
+        WHERE category.id = counts.category_id
+        """
+    )
+
+    op.create_table(
+        'data_versions',
+        sa.Column('dataset', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('dataset'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
+    op.drop_column('category', 'event_count')
@@ -0,0 +1,48 @@
+"""indexes for the hot query predicates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bookings: one booking per slot, and lookups by booker
+    op.create_index('ix_bookings_time_slot_id', 'bookings', ['time_slot_id'], unique=True)
+    op.create_index('ix_bookings_created_by', 'bookings', ['created_by'])
+
+    # Events: keyset pagination on (start_time, id), optionally narrowed by category or status
+    op.create_index('ix_events_start_time_id', 'events', ['start_time', 'id'])
+    op.create_index('ix_events_category_id_start_time_id', 'events', ['category_id', 'start_time', 'id'])
+    op.create_index('ix_events_status_start_time_id', 'events', ['status', 'start_time', 'id'])
+
+    # Category: listing order and case-insensitive unique names
+    op.create_index('ix_category_created_at', 'category', ['created_at'])
+    op.create_index(
+        'uq_category_lower_category_name',
+        'category',
+        [sa.text('lower(category_name)')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_category_lower_category_name', table_name='category')
+    op.drop_index('ix_category_created_at', table_name='category')
+    op.drop_index('ix_events_status_start_time_id', table_name='events')
+    op.drop_index('ix_events_category_id_start_time_id', table_name='events')
+    op.drop_index('ix_events_start_time_id', table_name='events')
+    op.drop_index('ix_bookings_created_by', table_name='bookings')
+    op.drop_index('ix_bookings_time_slot_id', table_name='bookings')
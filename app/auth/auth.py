@@ -1,7 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.auth.jwt import verify_access_token
+from app.auth.jwt import principal_from_claims, verify_access_token
+from app.auth.principal_cache import principal_cache
 from app.core.error_utils import handle_db_errors
 from app.db.operations.user import get_user_by_email_query
 from app.db.session import get_db
@@ -15,6 +16,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     """
     Return the user corresponding to the given token.
 
+    Tokens carrying principal claims are resolved from the token alone. Subject-only
+    tokens are served from the in-process principal cache when possible, so the
+    user table is only queried on a cache miss.
+
     Args:
         token: The JWT token given by the client. If the token is invalid, a 401 error is raised.
 
@@ -25,13 +30,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
    
     if not payload:
         raise AuthenticationException("Invalid token")
-    user_detailas = await get_user_by_email_query(db, payload.get("sub"))
+
+    try:
+        token_user = principal_from_claims(payload)
+    except (KeyError, ValueError):
+        raise AuthenticationException("Invalid token")
+    if token_user is not None:
+        return token_user
+
+    subject = payload.get("sub")
+    cached_user = principal_cache.get(subject)
+    if cached_user is not None:
+        return cached_user
+
+    user_detailas = await get_user_by_email_query(db, subject)
 
 
     if not user_detailas:
-        raise EmailNotFoundException(payload.get("sub"))
+        raise EmailNotFoundException(subject)
     
-    return  {
+    current_user = {
         "id": user_detailas.id,
         "lastname": user_detailas.lastname,
         "firstname": user_detailas.firstname,
@@ -39,6 +57,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         "is_verified": user_detailas.is_verified,
         "is_admin": user_detailas.is_admin,
     }
+    principal_cache.set(subject, current_user)
+    return current_user
 
 
 async def admin_required(current_user: User = Depends(get_current_user)):
@@ -13,6 +13,40 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return {"access_token": jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM), "token_type": "bearer", "exp": expire}
 
+def create_principal_token(user, expires_delta: timedelta = None):
+    """Create an access token for a user, embedding the principal claims when enabled."""
+    data = {"sub": user.email}
+    if settings.JWT_PRINCIPAL_CLAIMS:
+        data.update({
+            "id": user.id,
+            "firstname": user.firstname,
+            "lastname": user.lastname,
+            "is_admin": bool(user.is_admin),
+            "is_verified": bool(user.is_verified),
+            "cv": settings.JWT_CLAIMS_VERSION,
+        })
+    return create_access_token(data, expires_delta)
+
+def principal_from_claims(payload: dict):
+    """
+    Build the principal dict from a verified token payload.
+
+    Returns None for subject-only tokens, which must be resolved from the database.
+    Raises ValueError when the token carries an outdated claims version.
+    """
+    if "cv" not in payload:
+        return None
+    if payload["cv"] != settings.JWT_CLAIMS_VERSION:
+        raise ValueError("Token claims version is no longer accepted")
+    return {
+        "id": payload["id"],
+        "lastname": payload.get("lastname"),
+        "firstname": payload.get("firstname"),
+        "email": payload["sub"],
+        "is_verified": payload["is_verified"],
+        "is_admin": payload["is_admin"],
+    }
+
 def verify_access_token(token: str):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
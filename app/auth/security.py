@@ -1,6 +1,17 @@
 
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
 from passlib.context import CryptContext
 
+from app.core.config import get_settings
+from app.exceptions.user_exceptions import PasswordHashingBusyException
+
+settings = get_settings()
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
@@ -10,4 +21,77 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHashPool:
+    """Bounded worker pool that keeps bcrypt work off the event loop."""
+
+    def __init__(self, max_workers: int, max_queue: int, sample_size: int = 1024):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwd-hash")
+        self._lock = Lock()
+        self._latencies = deque(maxlen=sample_size)
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHashingBusyException()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self._latencies.append(elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies)
+            queued = max(self.pending - self.max_workers, 0)
+
+            def percentile(p):
+                if not samples:
+                    return 0.0
+                return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(self.pending, self.max_workers),
+                "queued": queued,
+                "peak_pending": self.peak_pending,
+                "saturation": self.pending / self.max_workers if self.max_workers else 0.0,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_p50_seconds": percentile(0.50),
+                "latency_p99_seconds": percentile(0.99),
+                "latency_max_seconds": samples[-1] if samples else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
@@ -21,13 +21,99 @@ class Settings():
     SECRET_KEY: str = "secretkey"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Sign id/is_admin/is_verified into the token so auth needs no DB lookup
+    JWT_PRINCIPAL_CLAIMS: bool = True
+    # Bump to reject every token issued with an older claims layout
+    JWT_CLAIMS_VERSION: int = 1
+
+    # Password hashing pool settings (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Principal cache settings (entries expire with the access token). Only consulted
+    # for subject-only tokens, i.e. when JWT_PRINCIPAL_CLAIMS is False; with claims the
+    # token itself is the principal and role changes apply when it expires. After
+    # changing a user's role or flags directly, evict them via DELETE /stats/principal_cache.
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
     
     
+    # Maximum number of slots a single batch reservation may claim
+    BOOKING_BATCH_MAX_SIZE: int = 50
+
+    # Maximum number of events a single bulk or recurring create may insert
+    EVENT_BULK_MAX_SIZE: int = 1000
+
+    # Category cache settings
+    CATEGORY_CACHE_TTL_SECONDS: int = 60
+    CATEGORY_CACHE_MAX_SIZE: int = 1024
+
+    # Share one in-flight DB query among identical concurrent reads; a positive window
+    # also reuses the result for callers arriving that long after the query started
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    SINGLE_FLIGHT_WINDOW_MS: float = float(os.getenv("SINGLE_FLIGHT_WINDOW_MS", "0"))
+
+    # Idempotency-Key replay store for POST writes
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+    # How long a key stays reserved while its first request is still running
+    IDEMPOTENCY_IN_FLIGHT_SECONDS: int = 60
+
+    # Token-bucket rate limits per route group: {"group": {"capacity": burst, "refill_per_second": rate}}
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMITS: dict = {
+        "auth": {"capacity": 10, "refill_per_second": 0.2},
+        "reads": {"capacity": 100, "refill_per_second": 20},
+        "booking_writes": {"capacity": 20, "refill_per_second": 2},
+        "admin": {"capacity": 50, "refill_per_second": 10},
+    }
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # Verified bearer tokens remembered so the limiter checks each signature once
+    RATE_LIMIT_TOKEN_CACHE_SIZE: int = 10000
+
+    # Slot change subscriptions (/slots/stream). "local" fans out within the worker that
+    # handled the write; "postgres" relays through LISTEN/NOTIFY to every worker.
+    SLOT_EVENTS_BACKEND: str = os.getenv("SLOT_EVENTS_BACKEND", "local")
+    SLOT_EVENTS_QUEUE_SIZE: int = 100
+    SLOT_EVENTS_MAX_SUBSCRIBERS: int = int(os.getenv("SLOT_EVENTS_MAX_SUBSCRIBERS", "10000"))
+    SLOT_EVENTS_KEEPALIVE_SECONDS: float = 15
+
+    # Expose Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Per-request SQL statement counting; X-DB-Queries / X-DB-Time headers are sent when DEBUG is on
+    SQL_QUERY_COUNTING: bool = os.getenv("SQL_QUERY_COUNTING", "true").lower() == "true"
+    # Log a warning when a request issues more statements than its budget
+    SQL_QUERY_BUDGET: int = int(os.getenv("SQL_QUERY_BUDGET", "10"))
+    # Per-route overrides keyed by "METHOD /route/template"
+    SQL_QUERY_BUDGETS: dict = {}
+
+    # Log the duration of every handle_db_errors operation at DEBUG and warn on slow ones
+    DB_OPERATION_TIMING: bool = os.getenv("DB_OPERATION_TIMING", "false").lower() == "true"
+    DB_SLOW_OPERATION_MS: float = float(os.getenv("DB_SLOW_OPERATION_MS", "200"))
+
     # Logging settings
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
-    # Database connection pool settings
+    # Pagination settings
+    EVENTS_PAGE_SIZE: int = 100
+    EVENTS_PAGE_MAX_SIZE: int = 500
+    # Rows fetched per server-side cursor round trip in NDJSON streaming mode
+    STREAM_CHUNK_SIZE: int = 500
 
+    # Database connection pool settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # asyncpg prepared statement cache per connection (set to 0 behind pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    # Apply pending alembic migrations at startup, then refuse to start if the schema is still behind
+    DB_AUTO_MIGRATE: bool = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+    DB_SCHEMA_CHECK: bool = os.getenv("DB_SCHEMA_CHECK", "true").lower() == "true"
+    # Production mode: never run DDL (CREATE DATABASE / migrations) at startup
+    DB_NO_DDL: bool = os.getenv("DB_NO_DDL", "false").lower() == "true"
 
     api_v1_prefix: str = "/api/v1"
 
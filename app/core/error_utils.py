@@ -1,43 +1,74 @@
+import inspect
 import logging
+import time
 from functools import wraps
 from typing import Callable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import get_settings
+from app.core.metrics import record_db_operation
+from app.core.query_stats import current_query_stats
 from app.exceptions.event_exceptions import DatabaseOperationException
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+def _session_parameter(func: Callable):
+    """Return (position, name) of the session parameter, or (None, None) if it has none."""
+    parameters = list(inspect.signature(func).parameters.values())
+    for position, parameter in enumerate(parameters):
+        if parameter.name == "db" or parameter.annotation is AsyncSession:
+            if parameter.kind is inspect.Parameter.KEYWORD_ONLY:
+                return None, parameter.name
+            return position, parameter.name
+    return None, None
+
+def _log_timing(operation_name: str, started: float):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < settings.DB_SLOW_OPERATION_MS:
+        logger.debug("%s took %.1fms", operation_name, elapsed_ms)
+        return
+    stats = current_query_stats.get()
+    if stats is not None:
+        logger.warning("Slow DB operation %s took %.1fms (%d statements so far in request)",
+                       operation_name, elapsed_ms, stats.count)
+    else:
+        logger.warning("Slow DB operation %s took %.1fms", operation_name, elapsed_ms)
 
 def handle_db_errors(operation_name: str):
-    """Decorator to handle database errors"""
+    """
+    Decorator to handle database errors.
+
+    The session argument is located once, when the operation is decorated. With
+    DB_OPERATION_TIMING on, every call is timed and calls slower than
+    DB_SLOW_OPERATION_MS are logged as warnings.
+    """
     def decorator(func: Callable) -> Callable:
+        session_position, session_name = _session_parameter(func)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            db_session: Optional[AsyncSession] = None
-            
-            # Find the database session in arguments
-            for arg in args:
-                if isinstance(arg, AsyncSession):
-                    db_session = arg
-                    break
-            
-            if not db_session:
-                for key, value in kwargs.items():
-                    if isinstance(value, AsyncSession):
-                        db_session = value
-                        break
-            
+            started = time.perf_counter()
             try:
-                return await func(*args, **kwargs)
-            except SQLAlchemyError as e:
-                if db_session:
-                    await db_session.rollback()
-                logger.error(f"Database error in {operation_name}: {str(e)}")
-                raise DatabaseOperationException(operation_name, str(e))
+                result = await func(*args, **kwargs)
             except Exception as e:
-                if db_session:
+                record_db_operation(operation_name, started, error=e)
+                db_session: Optional[AsyncSession] = (
+                    args[session_position] if session_position is not None and session_position < len(args)
+                    else kwargs.get(session_name)
+                )
+                if db_session is not None:
                     await db_session.rollback()
-                logger.error(f"Unexpected error in {operation_name}: {str(e)}")
+                if isinstance(e, SQLAlchemyError):
+                    logger.error("Database error in %s: %s", operation_name, e)
+                    raise DatabaseOperationException(operation_name, str(e))
+                logger.error("Unexpected error in %s: %s", operation_name, e)
                 raise
-        
+            finally:
+                if settings.DB_OPERATION_TIMING:
+                    _log_timing(operation_name, started)
+            record_db_operation(operation_name, started, result)
+            return result
+
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
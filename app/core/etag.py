@@ -0,0 +1,45 @@
+from threading import Lock
+from typing import Dict
+
+from fastapi import Request
+
+
+class ETagStats:
+    """Counts full responses vs 304 Not Modified answers per dataset."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, dataset: str, not_modified: bool):
+        with self._lock:
+            counts = self._counts.setdefault(dataset, {"requests": 0, "not_modified": 0})
+            counts["requests"] += 1
+            if not_modified:
+                counts["not_modified"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                dataset: {
+                    **counts,
+                    "not_modified_ratio": counts["not_modified"] / counts["requests"] if counts["requests"] else 0.0,
+                }
+                for dataset, counts in self._counts.items()
+            }
+
+
+etag_stats = ETagStats()
+
+
+def make_etag(dataset: str, version: int) -> str:
+    return f'W/"{dataset}-{version}"'
+
+
+def is_not_modified(request: Request, dataset: str, etag: str) -> bool:
+    """Check If-None-Match against the current ETag and record the outcome."""
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip() for tag in if_none_match.split(",") if tag.strip()}
+    not_modified = etag in candidates or "*" in candidates
+    etag_stats.record(dataset, not_modified)
+    return not_modified
@@ -0,0 +1,131 @@
+import hashlib
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, LRUCache
+from app.core.config import get_settings
+from app.core.responses import FastJSONResponse
+from app.exceptions.event_exceptions import (
+    IdempotencyKeyReusedException,
+    IdempotencyRequestInProgressException,
+    ValidationException
+)
+
+settings = get_settings()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+_IN_FLIGHT = "in_flight"
+_COMPLETED = "completed"
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Remembers the first successful response for each Idempotency-Key.
+
+    Entries live in a CacheBackend: the in-process LRU by default, or a shared
+    backend when several workers must see the same keys. A key is reserved
+    with `add` while its first request runs, so concurrent duplicates are
+    rejected instead of executed twice. Failed requests release their key so
+    the client can retry.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, in_flight_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_seconds = in_flight_seconds
+        self._lock = Lock()
+        self.replays = 0
+        self.first_requests = 0
+        self.conflicts = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[tuple]:
+        """Reserve the key and return None, or return the existing (state, fingerprint, content) entry."""
+        if await self.backend.add(key, (_IN_FLIGHT, fingerprint, None), self.in_flight_seconds):
+            self._count("first_requests")
+            return None
+
+        entry = await self.backend.get(key)
+        if entry is None:
+            # Expired between add and get; treat as a fresh request
+            await self.backend.set(key, (_IN_FLIGHT, fingerprint, None), self.in_flight_seconds)
+            self._count("first_requests")
+            return None
+
+        state, stored_fingerprint, _ = entry
+        self._count("replays" if state == _COMPLETED and stored_fingerprint == fingerprint else "conflicts")
+        return entry
+
+    async def complete(self, key: str, fingerprint: str, content: Any):
+        await self.backend.set(key, (_COMPLETED, fingerprint, content), self.ttl_seconds)
+
+    async def release(self, key: str):
+        await self.backend.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.replays + self.first_requests
+            return {
+                "first_requests": self.first_requests,
+                "replays": self.replays,
+                "conflicts": self.conflicts,
+                "hit_ratio": (self.replays / lookups) if lookups else 0.0,
+                "store": self.backend.stats(),
+            }
+
+
+idempotency_store = IdempotencyStore(
+    LRUCache(max_size=settings.IDEMPOTENCY_MAX_KEYS, ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    in_flight_seconds=settings.IDEMPOTENCY_IN_FLIGHT_SECONDS
+)
+
+
+async def run_idempotent(
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: BaseModel,
+    operation: Callable[[], Awaitable[Any]]
+):
+    """
+    Run a write once per Idempotency-Key.
+
+    `scope` namespaces the key (route and user), so keys only collide within
+    one client's requests to one route. Without a key the operation simply runs.
+    """
+    if idempotency_key is None:
+        return await operation()
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise ValidationException(f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters", IDEMPOTENCY_HEADER)
+
+    key = f"{scope}:{idempotency_key}"
+    fingerprint = request_fingerprint(payload)
+    entry = await idempotency_store.begin(key, fingerprint)
+    if entry is not None:
+        state, stored_fingerprint, content = entry
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedException(idempotency_key)
+        if state == _IN_FLIGHT:
+            raise IdempotencyRequestInProgressException(idempotency_key)
+        return FastJSONResponse(content, headers={REPLAYED_HEADER: "true"})
+
+    try:
+        content = jsonable_encoder(await operation())
+    except BaseException:
+        await idempotency_store.release(key)
+        raise
+    await idempotency_store.complete(key, fingerprint, content)
+    return FastJSONResponse(content)
@@ -0,0 +1,154 @@
+import logging
+import math
+import time
+
+from starlette.requests import Request
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_rate_limited_total,
+    http_requests_total
+)
+from app.core.query_stats import QueryStats, current_query_stats
+from app.core.rate_limit import RateLimitStore, client_key, rate_limit_store, route_group
+from app.exceptions.event_exceptions import RateLimitExceededException
+from app.exceptions.handlers import custom_exception_handler
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope) -> str:
+    """
+    Route path template (e.g. /event/{event_id}) of the endpoint that served the request.
+
+    The router records the matched endpoint in the scope; mapping it back to its
+    template keeps metric label cardinality bounded by the number of routes.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = {
+            getattr(route, "endpoint", None): route.path
+            for route in app.routes
+            if hasattr(route, "path")
+        }
+        app.state.route_templates = templates
+    return templates.get(endpoint, UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status counts and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = route_template(scope)
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, route)
+            http_requests_total.inc(method, route, str(status_code))
+
+
+class QueryCountMiddleware:
+    """
+    ASGI middleware counting SQL statements and DB time per request.
+
+    Adds X-DB-Queries / X-DB-Time response headers when DEBUG is on and logs a
+    warning when a route exceeds its query budget, to catch N+1 regressions.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"x-db-time", f"{stats.total_seconds * 1000:.2f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            route = f"{scope['method']} {route_template(scope)}"
+            budget = settings.SQL_QUERY_BUDGETS.get(route, settings.SQL_QUERY_BUDGET)
+            if stats.count > budget:
+                logger.warning(
+                    "Query budget exceeded on %s: %d statements (budget %d), %.2fms in DB",
+                    route, stats.count, budget, stats.total_seconds * 1000
+                )
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying token-bucket limits per client and route group.
+
+    Clients are identified by the user id in their bearer token, or by IP for
+    anonymous requests. Rejected requests get a 429 with Retry-After.
+    """
+
+    def __init__(self, app, store: RateLimitStore = rate_limit_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], scope["path"])
+        limit = settings.RATE_LIMITS.get(group) if group else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait = await self.store.take(
+            f"{group}:{client_key(scope)}", limit["capacity"], limit["refill_per_second"]
+        )
+        if wait <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        http_requests_rate_limited_total.inc(group)
+        retry_after = max(1, math.ceil(wait)) if math.isfinite(wait) else 3600
+        response = await custom_exception_handler(
+            Request(scope), RateLimitExceededException(group, retry_after)
+        )
+        response.headers["Retry-After"] = str(retry_after)
+        await response(scope, receive, send)
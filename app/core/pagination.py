@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.exceptions.event_exceptions import ValidationException
+
+
+def encode_cursor(start_time: datetime, row_id: int) -> str:
+    """Encode a keyset position on (start_time, id) as an opaque URL-safe token."""
+    raw = json.dumps({"t": start_time.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor produced by encode_cursor; raises ValidationException if malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationException("Invalid pagination cursor", "cursor")
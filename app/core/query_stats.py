@@ -0,0 +1,40 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+
+class QueryStats:
+    """Statements executed and time spent in the database during one request."""
+
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if start_times:
+        stats.total_seconds += time.perf_counter() - start_times.pop()
+    stats.count += 1
+
+
+def instrument_engine(engine):
+    """Attach statement counting hooks to an engine (sync or async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
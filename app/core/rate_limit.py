@@ -0,0 +1,162 @@
+import math
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from app.auth.jwt import verify_access_token
+from app.core.config import get_settings
+
+settings = get_settings()
+
+AUTH_GROUP = "auth"
+READS_GROUP = "reads"
+BOOKING_WRITES_GROUP = "booking_writes"
+ADMIN_GROUP = "admin"
+
+# (method or None for any, path, group); first match wins. Paths ending in "/"
+# match as prefixes, others match exactly (ignoring a trailing slash).
+ROUTE_GROUP_RULES = (
+    ("POST", "/login", AUTH_GROUP),
+    ("POST", "/register", AUTH_GROUP),
+    (None, "/reserve_slot", BOOKING_WRITES_GROUP),
+    (None, "/reserve_slots", BOOKING_WRITES_GROUP),
+    (None, "/cancel_slot/", BOOKING_WRITES_GROUP),
+    (None, "/stats/", ADMIN_GROUP),
+    ("POST", "/categories", ADMIN_GROUP),
+    (None, "/categories/", ADMIN_GROUP),
+    (None, "/category", ADMIN_GROUP),
+    (None, "/category/", ADMIN_GROUP),
+    (None, "/create_event", ADMIN_GROUP),
+    (None, "/create_events", ADMIN_GROUP),
+    (None, "/event", ADMIN_GROUP),
+    (None, "/event/", ADMIN_GROUP),
+    ("GET", "/", READS_GROUP),
+)
+
+# Operational endpoints are never limited
+EXEMPT_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+def _path_matches(rule_path: str, path: str) -> bool:
+    if rule_path.endswith("/"):
+        return path.startswith(rule_path)
+    return path == rule_path or path == rule_path + "/"
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """Budget group for a request, or None when it is not rate limited."""
+    if path.startswith(EXEMPT_PATHS):
+        return None
+    for rule_method, rule_path, group in ROUTE_GROUP_RULES:
+        if (rule_method is None or rule_method == method) and _path_matches(rule_path, path):
+            return group
+    return None
+
+
+class _TokenSubjects:
+    """
+    Bounded map from bearer token to the rate-limit subject it verified to.
+
+    Each distinct token is verified once; later requests with it skip the JWT
+    signature check until the token expires. Tokens that fail verification are
+    not cached and fall back to the client IP, so made-up tokens cannot mint
+    fresh buckets.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(token)
+                    return entry[0]
+                del self._entries[token]
+
+        payload = verify_access_token(token)
+        if not payload:
+            return None
+        subject = f"user:{payload.get('id') or payload.get('sub')}"
+        expires_at = payload.get("exp", now)
+        if expires_at > now:
+            with self._lock:
+                self._entries[token] = (subject, expires_at)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return subject
+
+
+_token_subjects = _TokenSubjects(max_size=settings.RATE_LIMIT_TOKEN_CACHE_SIZE)
+
+
+def client_key(scope) -> str:
+    """Authenticated user id from the bearer token, falling back to the client IP."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = _token_subjects.get(token)
+                if subject is not None:
+                    return subject
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitStore:
+    """
+    Interface for token-bucket storage.
+
+    `take` is async so a shared backend (e.g. Redis with an atomic script) can
+    keep limits correct across workers without changing the middleware.
+    """
+
+    async def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        """Consume `cost` tokens; return 0 when allowed, else seconds until enough tokens refill."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process token buckets.
+
+    At most `max_keys` buckets are kept; evicting the least recently used one
+    only ever resets a client to a full bucket.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (cost - tokens) / refill_per_second if refill_per_second > 0 else math.inf
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"buckets": len(self._buckets), "max_keys": self.max_keys}
+
+
+rate_limit_store = InMemoryRateLimitStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
@@ -0,0 +1,33 @@
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _orjson_default(value: Any):
+    # orjson handles datetimes, dicts and lists natively; only row mappings and
+    # the odd Decimal reach this hook.
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Default response class, rendered with orjson.
+
+    Returning an instance directly from a route bypasses FastAPI's response
+    model validation and `jsonable_encoder`, so result rows (including
+    SQLAlchemy `RowMapping` objects) are serialized in a single pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
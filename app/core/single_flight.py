@@ -0,0 +1,115 @@
+import asyncio
+import inspect
+import time
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class _LeaderCancelled(Exception):
+    """The caller running the shared query went away before it finished."""
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls within one worker.
+
+    The first caller for a key (the leader) runs the call on its own session;
+    callers arriving while it is in flight, or up to `window_seconds` after it
+    started, await the leader's result instead of checking out a connection.
+    Errors are shared with current waiters but never reused afterwards.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._calls: Dict[Hashable, tuple] = {}
+        self._lock = Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        entry = self._calls.get(key)
+        if entry is not None:
+            future, started = entry
+            if not future.done() or time.monotonic() - started <= self.window_seconds:
+                self._count("shared")
+                try:
+                    return await asyncio.shield(future)
+                except _LeaderCancelled:
+                    pass
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = (future, time.monotonic())
+        self._count("leaders")
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._forget(key, future)
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        except BaseException as e:
+            self._forget(key, future)
+            future.set_exception(e)
+            future.exception()
+            raise
+        future.set_result(result)
+        if self.window_seconds <= 0:
+            self._forget(key, future)
+        else:
+            asyncio.get_running_loop().call_later(self.window_seconds, self._forget, key, future)
+        return result
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        entry = self._calls.get(key)
+        if entry is not None and entry[0] is future:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.leaders + self.shared
+            return {
+                "in_flight": len(self._calls),
+                "window_seconds": self.window_seconds,
+                "leaders": self.leaders,
+                "shared": self.shared,
+                "shared_ratio": (self.shared / calls) if calls else 0.0,
+            }
+
+
+single_flight_group = SingleFlight(window_seconds=settings.SINGLE_FLIGHT_WINDOW_MS / 1000)
+
+
+def single_flight(operation_name: str):
+    """
+    Decorator coalescing concurrent calls of a read operation with equal arguments.
+
+    The session argument is left out of the key, so each caller still passes its
+    own; only the leader's session runs the query. Callers needing read-your-writes
+    should pass something that changes on write (e.g. the dataset version) as an
+    argument, so they never join a flight that started before their commit.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.SINGLE_FLIGHT_ENABLED:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (operation_name,) + tuple(
+                (name, value) for name, value in bound.arguments.items() if name != "db"
+            )
+            return await single_flight_group.do(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
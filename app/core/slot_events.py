@@ -0,0 +1,237 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import asyncpg
+
+from app.core.config import get_settings
+from app.core.responses import dumps
+from app.exceptions.event_exceptions import SlotSubscriberLimitException
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NOTIFY_CHANNEL = "slot_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7500
+
+KEEPALIVE = b": keepalive\n\n"
+OVERFLOW = b"event: overflow\ndata: {}\n\n"
+
+BOOKED = "booked"
+CANCELLED = "cancelled"
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+def slot_delta(change: str, event_id: int, category_id: int, status: Optional[str] = None, **fields) -> dict:
+    """A slot change as sent to subscribers; `category_id` drives the subscription filter."""
+    return {"change": change, "event_id": event_id, "category_id": category_id, "status": status, **fields}
+
+
+class Subscription:
+    __slots__ = ("category_id", "queue", "overflowed")
+
+    def __init__(self, category_id: Optional[int], queue_size: int):
+        self.category_id = category_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class SlotEventHub:
+    """
+    Fans slot deltas out to Server-Sent Events subscribers in this worker.
+
+    Subscribers are indexed by category, so a delta only touches the queues of
+    subscribers that asked for its category (or for all categories), and it is
+    encoded once no matter how many receive it. Idle connections cost a queue and
+    a suspended coroutine; one hub-wide task sends keepalives. A subscriber whose
+    queue fills up is told to resync and disconnected rather than slowing the
+    publisher down.
+
+    With SLOT_EVENTS_BACKEND="postgres" deltas are relayed through LISTEN/NOTIFY
+    so that subscribers on every worker see writes handled by any of them.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int, keepalive_seconds: float, backend: str = "local"):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.keepalive_seconds = keepalive_seconds
+        self.backend = backend
+        self._subscribers: Dict[Optional[int], Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._sequence = 0
+        self._lock = Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._connection = None
+        self._notify_lock: Optional[asyncio.Lock] = None
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    # Subscriptions
+
+    def subscribe(self, category_id: Optional[int] = None) -> Subscription:
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise SlotSubscriberLimitException(self.max_subscribers)
+            subscription = Subscription(category_id, self.queue_size)
+            self._subscribers[category_id].add(subscription)
+            self._count += 1
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.category_id)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._count -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.category_id]
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        """
+        Yield SSE frames for a subscription until it overflows or the client leaves,
+        then unsubscribe. Subscribe before the response starts, so a full hub is
+        reported as an error status rather than a broken stream.
+        """
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                frame = await subscription.queue.get()
+                yield frame
+                if frame is OVERFLOW:
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    # Publishing
+
+    async def publish(self, deltas: Iterable[dict]):
+        """Send deltas to subscribers; call after the write that produced them has committed."""
+        deltas = list(deltas)
+        if not deltas:
+            return
+        if self.backend == "postgres" and self._connection is not None:
+            try:
+                await self._notify(deltas)
+                return
+            except Exception as e:
+                logger.warning("Slot event NOTIFY failed, delivering locally only: %s", e)
+        self.dispatch(deltas)
+
+    def dispatch(self, deltas: Iterable[dict]):
+        for delta in deltas:
+            self._sequence += 1
+            self.published += 1
+            frame = b"id: %d\nevent: slot\ndata: %s\n\n" % (self._sequence, dumps(delta))
+            categories = {delta.get("category_id"), delta.get("previous_category_id")}
+            targets = list(self._subscribers.get(None, ()))
+            for category_id in categories:
+                if category_id is not None:
+                    targets.extend(self._subscribers.get(category_id, ()))
+            for subscription in targets:
+                self._offer(subscription, frame)
+
+    def _offer(self, subscription: Subscription, frame: bytes):
+        if subscription.overflowed:
+            return
+        queue = subscription.queue
+        if queue.qsize() < self.queue_size - 1:
+            queue.put_nowait(frame)
+            if frame is not KEEPALIVE:
+                self.delivered += 1
+            return
+        if frame is KEEPALIVE:
+            return
+        # Keep the last slot for the overflow marker so the client knows to resync
+        subscription.overflowed = True
+        self.overflows += 1
+        queue.put_nowait(OVERFLOW)
+
+    # Lifecycle
+
+    async def start(self):
+        self._tasks.append(asyncio.create_task(self._keepalive()))
+        if self.backend == "postgres":
+            self._notify_lock = asyncio.Lock()
+            self._tasks.append(asyncio.create_task(self._listen()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_seconds)
+            for subscribers in list(self._subscribers.values()):
+                for subscription in list(subscribers):
+                    self._offer(subscription, KEEPALIVE)
+
+    async def _listen(self):
+        dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+        while True:
+            terminated = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(dsn)
+                self._connection.add_termination_listener(lambda connection: terminated.set())
+                await self._connection.add_listener(NOTIFY_CHANNEL, self._on_notification)
+                logger.info("Listening for slot events on channel %s", NOTIFY_CHANNEL)
+                await terminated.wait()
+                logger.warning("Slot event listener connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Slot event listener failed: %s", e)
+            if self._connection is not None and not self._connection.is_closed():
+                self._connection.terminate()
+            self._connection = None
+            await asyncio.sleep(1)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self.dispatch(json.loads(payload))
+
+    async def _notify(self, deltas: List[dict]):
+        batches, batch, size = [], [], 2
+        for delta in deltas:
+            encoded = dumps(delta)
+            if batch and size + len(encoded) + 1 > NOTIFY_PAYLOAD_LIMIT:
+                batches.append(batch)
+                batch, size = [], 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        batches.append(batch)
+        async with self._notify_lock:
+            for batch in batches:
+                await self._connection.execute(
+                    "SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, (b"[" + b",".join(batch) + b"]").decode()
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "subscribers": self._count,
+                "categories": len(self._subscribers),
+                "published": self.published,
+                "delivered": self.delivered,
+                "overflows": self.overflows,
+            }
+
+
+slot_event_hub = SlotEventHub(
+    queue_size=settings.SLOT_EVENTS_QUEUE_SIZE,
+    max_subscribers=settings.SLOT_EVENTS_MAX_SUBSCRIBERS,
+    keepalive_seconds=settings.SLOT_EVENTS_KEEPALIVE_SECONDS,
+    backend=settings.SLOT_EVENTS_BACKEND
+)
@@ -0,0 +1,39 @@
+from typing import Any, AsyncIterator, Mapping
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.responses import dumps
+
+settings = get_settings()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client opted into streaming via the Accept header."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def stream_partitions(db: AsyncSession, query) -> AsyncIterator[list]:
+    """Run a query on a server-side cursor and yield row mappings in chunks."""
+    result = await db.stream(query.execution_options(yield_per=settings.STREAM_CHUNK_SIZE))
+    async for partition in result.mappings().partitions():
+        yield partition
+
+
+async def _ndjson_lines(partitions: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    async for partition in partitions:
+        yield b"".join(dumps(row) + b"\n" for row in partition)
+
+
+def ndjson_response(partitions: AsyncIterator[list[Mapping[str, Any]]]) -> StreamingResponse:
+    """
+    Stream row partitions as newline-delimited JSON.
+
+    Each partition is written to the socket as soon as it is read, so peak
+    memory is bounded by the partition size rather than the result size.
+    """
+    return StreamingResponse(_ndjson_lines(partitions), media_type=NDJSON_MEDIA_TYPE)
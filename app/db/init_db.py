@@ -1,26 +1,70 @@
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from app.db.models import Base
+import time
+from typing import List, Dict, Any, Optional
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from app.db.migrations import SCHEMA_LOCK_SQL, ensure_schema_revision, get_current_revision, get_head_revision, upgrade_to_head
+from app.db.models.startup_state import StartupState
 from app.db.models.user import User
-from app.auth.security import hash_password
+from app.auth.security import hash_password_async
+from app.core.config import get_settings
 from datetime import datetime
 
+settings = get_settings()
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_USERS_STATE = "default_users"
+
+# Phase timings of the most recent startup, in seconds
+last_startup_report: Dict[str, Any] = {}
+
+def default_users_fingerprint(default_users: List[Dict[str, Any]]) -> str:
+    """
+    Fingerprint the seed data. Passwords are left out: seeding never updates existing
+    users, so a changed password alone does not change what the seed would do.
+    """
+    seed = sorted(
+        ({key: value for key, value in user.items() if key != "password"} for user in default_users),
+        key=lambda user: user["email"]
+    )
+    return hashlib.sha256(json.dumps(seed, sort_keys=True, default=str).encode()).hexdigest()
+
 class DatabaseInitializer:
     """Handle database creation and initialization"""
     
-    def __init__(self, database_url: str, database_name: str):
+    def __init__(self, database_url: str, database_name: str, engine: Optional[AsyncEngine] = None):
         self.database_url = database_url
         self.database_name = database_name
         self.server_url = database_url.rsplit('/', 1)[0]  # Remove database name
+        # An engine created here is disposed at the end of initialize(); a passed-in one is left to its owner
+        self.owns_engine = engine is None
+        self.engine = engine or create_async_engine(database_url, echo=settings.DB_ECHO)
+
+    async def database_exists(self) -> bool:
+        """Probe the target database with the application engine; this also warms the pool"""
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            original = getattr(e, "orig", e)
+            if "InvalidCatalogName" in type(original).__name__ or "does not exist" in str(e):
+                return False
+            raise
         
     async def create_database_if_not_exists(self):
         """Create database if it doesn't exist"""
+        if await self.database_exists():
+            logger.info(f"Database '{self.database_name}' already exists")
+            return
+
         try:
             # Convert async URL to sync URL for database creation
             sync_server_url = self.server_url.replace('asyncpg', 'psycopg2')
@@ -51,85 +95,124 @@ class DatabaseInitializer:
             logger.error(f"Error creating database: {str(e)}")
             raise
 
-    async def create_tables(self):
-        """Create all tables"""
+    async def run_migrations(self, apply: bool = True) -> str:
+        """
+        Bring the schema to the head alembic revision, skipping all DDL when it is already there.
+
+        The unlocked check is only a fast path; upgrade_to_head re-checks under the schema lock.
+        """
         try:
-            logger.info(f"Creating tables using URL: {self.database_url}")
-            async_engine = create_async_engine(self.database_url, echo=True)  # Added echo for debugging
-            
-            async with async_engine.begin() as conn:
-                # Import all models to ensure they're registered with Base
-                # This is crucial - make sure all your model files are imported
-                try:
-                    # Import all your model modules here
-                    from app.db.models import user  # Import your models
-                    # Add other model imports as needed
-                    logger.info("Models imported successfully")
-                except ImportError as e:
-                    logger.error(f"Error importing models: {e}")
-                    raise
-                
-                # Create all tables
-                await conn.run_sync(Base.metadata.create_all, checkfirst=True)
-                logger.info("All tables created successfully")
-                
-                # Log created tables for debugging
-                table_names = list(Base.metadata.tables.keys())
-                logger.info(f"Created tables: {table_names}")
-                
-            await async_engine.dispose()
-            
+            head = get_head_revision()
+            current = await get_current_revision(self.engine)
+            if current == head:
+                logger.info(f"Database schema already at revision {head}")
+                return current
+
+            if apply:
+                logger.info(f"Migrating database schema from {current or 'none'} to {head}")
+                await upgrade_to_head(self.engine)
+                current = head
+
+            return current
+
         except Exception as e:
-            logger.error(f"Error creating tables: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"Error applying migrations: {str(e)}")
             raise
 
     async def add_default_users(self, session: AsyncSession, default_users: List[Dict[str, Any]]):
-        """Add default users to the database"""
+        """Add missing default users, skipping the whole step when the seed fingerprint is unchanged"""
         try:
-            logger.info(f"Adding {len(default_users)} default users...")
-            
-            for user_data in default_users:
-                logger.info(f"Processing user: {user_data.get('email', 'Unknown')}")
-                
-                # Use SQLAlchemy ORM instead of raw SQL for better compatibility
-                from sqlalchemy import select
-                
-                # Check if user already exists using ORM
-                stmt = select(User).where(User.email == user_data["email"])
-                result = await session.execute(stmt)
-                existing_user = result.scalar_one_or_none()
-                
-                if not existing_user:
-                    # Create user
-                    hashed_password = hash_password(user_data["password"])
-                    user = User(
-                        email=user_data["email"],
-                        firstname=user_data.get("firstname"),  # Fixed field mapping
-                        lastname=user_data.get("lastname", ""),
-                        hashed_password=hashed_password,
-                        is_admin=user_data.get("is_admin", True),
-                        is_verified=user_data.get("is_verified", False),
-                        created_at=datetime.now(),
-                        modified_at=datetime.now()
-                    )
-                    
-                    session.add(user)
-                    logger.info(f"Added default user: {user_data['email']}")
-                else:
-                    logger.info(f"User already exists: {user_data['email']}")
-            
+            # Serialize seeding with other booting workers; the fingerprint check
+            # below then sees a seed that another worker just committed.
+            await session.execute(SCHEMA_LOCK_SQL)
+            fingerprint = default_users_fingerprint(default_users)
+            stored = await session.execute(
+                select(StartupState.fingerprint).where(StartupState.name == DEFAULT_USERS_STATE)
+            )
+            if stored.scalar_one_or_none() == fingerprint:
+                logger.info("Default users unchanged since last startup, skipping seed")
+                return 0
+
+            emails = [user_data["email"] for user_data in default_users]
+            existing = await session.execute(select(User.email).where(User.email.in_(emails)))
+            existing_emails = set(existing.scalars().all())
+            missing_users = [user_data for user_data in default_users if user_data["email"] not in existing_emails]
+
+            # Only users that will actually be inserted pay for a bcrypt hash
+            hashed_passwords = await asyncio.gather(
+                *(hash_password_async(user_data["password"]) for user_data in missing_users)
+            )
+
+            now = datetime.now()
+            for user_data, hashed_password in zip(missing_users, hashed_passwords):
+                session.add(User(
+                    email=user_data["email"],
+                    firstname=user_data.get("firstname"),
+                    lastname=user_data.get("lastname", ""),
+                    hashed_password=hashed_password,
+                    is_admin=user_data.get("is_admin", True),
+                    is_verified=user_data.get("is_verified", False),
+                    created_at=now,
+                    modified_at=now
+                ))
+                logger.info(f"Added default user: {user_data['email']}")
+
+            stmt = insert(StartupState).values(name=DEFAULT_USERS_STATE, fingerprint=fingerprint, updated_at=now)
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=[StartupState.name],
+                set_={"fingerprint": fingerprint, "updated_at": now}
+            ))
             await session.commit()
-            logger.info("Default users processed successfully")
+            logger.info(f"Default users processed successfully ({len(missing_users)} added)")
+            return len(missing_users)
             
         except Exception as e:
             await session.rollback()
             logger.error(f"Error adding default users: {str(e)}")
-            import traceback
-            traceback.print_exc()
             raise
 
+    async def initialize(self, session_factory, default_users: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run the startup pipeline and return a per-phase timing report.
+
+        With DB_NO_DDL set, no CREATE DATABASE or migration is attempted; the schema
+        must already be at head.
+        """
+        allow_ddl = not settings.DB_NO_DDL
+        report: Dict[str, Any] = {"mode": "ddl" if allow_ddl else "no-ddl", "phases": {}}
+        started = time.perf_counter()
+
+        try:
+            phase_start = time.perf_counter()
+            if allow_ddl:
+                await self.create_database_if_not_exists()
+            report["phases"]["database"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            revision = await self.run_migrations(apply=allow_ddl and settings.DB_AUTO_MIGRATE)
+            if settings.DB_SCHEMA_CHECK:
+                ensure_schema_revision(revision, get_head_revision())
+            report["schema_revision"] = revision
+            report["phases"]["schema"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            async with session_factory() as session:
+                report["seeded_users"] = await self.add_default_users(session, default_users)
+            report["phases"]["seed"] = time.perf_counter() - phase_start
+        finally:
+            if self.owns_engine:
+                await self.engine.dispose()
+
+        report["total"] = time.perf_counter() - started
+        last_startup_report.clear()
+        last_startup_report.update(report)
+        logger.info(
+            "Startup finished in %.3fs (%s)",
+            report["total"],
+            ", ".join(f"{name}={seconds:.3f}s" for name, seconds in report["phases"].items())
+        )
+        return report
+
     async def verify_tables_created(self):
         """Verify that tables were created successfully"""
         try:
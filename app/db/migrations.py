@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Revision matching the schema that Base.metadata.create_all used to produce
+BASELINE_REVISION = "0001"
+
+# pg_advisory_xact_lock key serializing schema changes and seeding across workers
+SCHEMA_LOCK_KEY = 0x6170695363686d61
+
+SCHEMA_LOCK_SQL = text("SELECT pg_advisory_xact_lock(:key)").bindparams(key=SCHEMA_LOCK_KEY)
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised at startup when the live schema is behind the migrations shipped with the code."""
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return config
+
+
+def get_head_revision() -> str:
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def _current_revision(connection) -> str:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def lock_schema(connection):
+    """Block until no other worker is changing the schema; held until the transaction ends."""
+    connection.execute(SCHEMA_LOCK_SQL)
+
+
+def _upgrade(connection):
+    # Workers booting together queue here; the revision is re-read under the lock
+    # so that only the first one runs the DDL.
+    lock_schema(connection)
+    current = _current_revision(connection)
+    if current == get_head_revision():
+        return
+
+    config = get_alembic_config()
+    config.attributes["connection"] = connection
+
+    # Databases created by create_all before migrations existed are adopted at the baseline
+    if current is None and inspect(connection).has_table("user"):
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+
+
+async def upgrade_to_head(engine: AsyncEngine):
+    """Apply every pending migration, serialized across workers by SCHEMA_LOCK_KEY."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
+
+
+async def get_current_revision(engine: AsyncEngine) -> str:
+    async with engine.connect() as conn:
+        return await conn.run_sync(_current_revision)
+
+
+def ensure_schema_revision(current: str, head: str):
+    """Raise SchemaOutOfDateError unless the database is at the head revision."""
+    if current != head:
+        raise SchemaOutOfDateError(
+            f"Database schema is at revision {current or 'none'} but the code expects {head}; "
+            f"run `alembic upgrade head`"
+        )
+
+
+async def check_schema_up_to_date(engine: AsyncEngine):
+    """Fail fast if the database has not been migrated to the head revision."""
+    ensure_schema_revision(await get_current_revision(engine), get_head_revision())
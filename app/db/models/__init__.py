@@ -2,5 +2,7 @@ from app.db.models.user import Base
 from app.db.models.events import Base
 from app.db.models.categories import Base
 from app.db.models.bookings import Base
+from app.db.models.data_versions import Base
+from app.db.models.startup_state import Base
 
-__all__ = ["Base"]
\ No newline at end of file
+__all__ = ["Base"]
@@ -16,8 +16,9 @@ class Bookings(Base):
     __tablename__ = "bookings"
 
     id = Column(Integer, primary_key=True, index=True)
-    created_by = Column(Integer, ForeignKey("user.id"), nullable=False)
-    time_slot_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
+    # One booking per slot; the unique index backs the atomic claim in create_booking_query
+    time_slot_id = Column(Integer, ForeignKey("events.id"), nullable=False, unique=True, index=True)
     booked_at = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     modified_at = Column(DateTime(timezone=True), onupdate=func.now())
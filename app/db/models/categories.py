@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, DateTime, String, func
 from app.db.models.base import Base
 from sqlalchemy.orm import relationship
 
@@ -9,11 +9,18 @@ class Category(Base):
     category_name = Column(String, nullable=False)
     color = Column(String, nullable=False)
     created_by = Column(Integer, ForeignKey("user.id"), nullable=False) 
-    created_at = Column(DateTime, nullable=False)
+    # Maintained by the event write paths; repair drift with `python -m app.db.reconcile_counts`
+    event_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, nullable=False, index=True)
     modified_at = Column(DateTime, nullable=False)
+    # Row version for optimistic concurrency, bumped by every admin update
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     creator = relationship("User", back_populates="created_categories", foreign_keys=[created_by])
     events = relationship("Events", back_populates="category")
 
     def __repr__(self):
-        return f"<Category(id={self.id}, name='{self.category_name}')>"
\ No newline at end of file
+        return f"<Category(id={self.id}, name='{self.category_name}')>"
+
+# Category names are unique regardless of case
+Index("uq_category_lower_category_name", func.lower(Category.category_name), unique=True)
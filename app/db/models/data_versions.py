@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, String
+from app.db.models.base import Base
+
+# Dataset names whose version stamps back the ETags of the read endpoints
+EVENTS_DATASET = "events"
+CATEGORIES_DATASET = "categories"
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    dataset = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion(dataset='{self.dataset}', version={self.version})>"
@@ -1,9 +1,15 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DateTime, Text
 from app.db.models.base import Base
 from sqlalchemy.orm import relationship
 
 class Events(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination on (start_time, id), optionally narrowed by category or status
+        Index("ix_events_start_time_id", "start_time", "id"),
+        Index("ix_events_category_id_start_time_id", "category_id", "start_time", "id"),
+        Index("ix_events_status_start_time_id", "status", "start_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_name = Column(String, nullable=False)
@@ -15,6 +21,8 @@ class Events(Base):
     created_by = Column(Integer, ForeignKey("user.id"), nullable=False)
     created_at = Column(DateTime, nullable=False)
     modified_at = Column(DateTime, nullable=False)
+    # Row version for optimistic concurrency, bumped by every admin update
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     category = relationship("Category", back_populates="events", foreign_keys=[category_id])
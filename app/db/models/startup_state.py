@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+from app.db.models.base import Base
+
+class StartupState(Base):
+    """Fingerprints of one-off startup work (e.g. seeding) so later boots can skip it."""
+    __tablename__ = "startup_state"
+
+    name = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<StartupState(name='{self.name}', fingerprint='{self.fingerprint}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import delete, update, and_
+from sqlalchemy import delete, insert, literal, update, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import aliased
@@ -8,7 +8,7 @@ from app.db.models.bookings import Bookings
 from app.db.models.categories import Category
 from app.db.models.events import Events
 from app.db.models.user import User
-from app.schemas.bookings import BookingsCreate
+from app.schemas.bookings import BookingsBatchCreate, BookingsCreate
 from app.exceptions.booking_exceptions import (
     BookingNotFoundException,
     TimeSlotAlreadyBookedException,
@@ -17,8 +17,86 @@ from app.exceptions.booking_exceptions import (
     UserNotFoundException
 )
 from app.exceptions.event_exceptions import ValidationException
+from app.core.config import get_settings
 from app.core.error_utils import handle_db_errors
+from app.core.slot_events import BOOKED, CANCELLED, slot_delta, slot_event_hub
+from app.db.models.data_versions import EVENTS_DATASET
+from app.db.operations.data_versions import bump_data_versions
 
+settings = get_settings()
+
+
+def _claim_and_book_stmt(time_slot_ids: list, user_id: int):
+    """
+    Claim free slots and insert their bookings in a single statement:
+
+    WITH claimed AS (UPDATE events SET status='BOOKED' WHERE id IN (
+        SELECT id FROM events WHERE id IN (:ids) AND status <> 'BOOKED' ORDER BY id FOR UPDATE
+    ) RETURNING id, category_id),
+    booked AS (INSERT INTO bookings (created_by, time_slot_id) SELECT :user_id, id FROM claimed RETURNING ...)
+    SELECT booked.*, claimed.category_id FROM booked JOIN claimed ON booked.time_slot_id = claimed.id
+
+    Rows are locked in id order so overlapping batches cannot deadlock. The unique
+    constraint on bookings.time_slot_id backs this up against concurrent claims.
+    """
+    lockable = (
+        select(Events.id)
+        .where(Events.id.in_(time_slot_ids), Events.status != "BOOKED")
+        .order_by(Events.id)
+        .with_for_update()
+    )
+    claimed = (
+        update(Events)
+        .where(Events.id.in_(lockable.scalar_subquery()))
+        .values(status="BOOKED")
+        .returning(Events.id, Events.category_id)
+        .cte("claimed")
+    )
+    booked = (
+        insert(Bookings)
+        .from_select(
+            ["created_by", "time_slot_id"],
+            select(literal(user_id), claimed.c.id)
+        )
+        .returning(
+            Bookings.id,
+            Bookings.created_by,
+            Bookings.time_slot_id,
+            Bookings.booked_at,
+            Bookings.created_at,
+            Bookings.modified_at
+        )
+        .cte("booked")
+    )
+    return (
+        select(*booked.c, claimed.c.category_id)
+        .select_from(booked.join(claimed, booked.c.time_slot_id == claimed.c.id))
+    )
+
+def _split_category(row) -> tuple:
+    """Separate the claimed slot's category (used for change notifications) from the booking row."""
+    booking = dict(row)
+    return booking, booking.pop("category_id")
+
+async def _booking_conflicts(db: AsyncSession, time_slot_ids: list) -> dict:
+    """Explain why slots could not be claimed; only runs on the failure path."""
+    result = await db.execute(
+        select(Events.id, Events.status, Bookings.created_by)
+        .select_from(Events)
+        .outerjoin(Bookings, Bookings.time_slot_id == Events.id)
+        .where(Events.id.in_(time_slot_ids))
+    )
+    rows = {row.id: row for row in result.all()}
+
+    conflicts = {}
+    for time_slot_id in time_slot_ids:
+        row = rows.get(time_slot_id)
+        if row is None:
+            conflicts[time_slot_id] = TimeSlotNotFoundException(time_slot_id)
+        elif row.created_by is not None or row.status == "BOOKED":
+            # Includes the caller's own booking, as before the single-statement path
+            conflicts[time_slot_id] = TimeSlotAlreadyBookedException(time_slot_id)
+    return conflicts
 
 @handle_db_errors("create_booking_query")
 async def create_booking_query(db: AsyncSession, booking: BookingsCreate, user_id: int):
@@ -30,71 +108,111 @@ async def create_booking_query(db: AsyncSession, booking: BookingsCreate, user_i
     if not user_id or user_id <= 0:
         raise ValidationException("Valid user ID is required", "user_id")
     
-    # Check if user exists
-    user_result = await db.execute(select(User).where(User.id == user_id))
-    user = user_result.scalar_one_or_none()
-    if not user:
-        raise UserNotFoundException(user_id)
-    
-    # Check if time slot (event) exists and get its current status
-    event_result = await db.execute(
-        select(Events).where(Events.id == booking.time_slot_id)
-    )
-    event = event_result.scalar_one_or_none()
-    if not event:
-        raise TimeSlotNotFoundException(booking.time_slot_id)
-    
-    # Check if time slot is available for booking
-    if event.status == "BOOKED":
-        raise TimeSlotAlreadyBookedException(booking.time_slot_id)
-    
-    # Check if user already has a booking for this time slot
-    existing_user_booking = await db.execute(
-        select(Bookings).where(
-            and_(
-                Bookings.time_slot_id == booking.time_slot_id,
-                Bookings.created_by == user_id
-            )
-        )
-    )
-    if existing_user_booking.scalar_one_or_none():
-        raise ValidationException("You already have a booking for this time slot")
-    
-    # Check for any existing booking (double-check for race conditions)
-    existing_booking_result = await db.execute(
-        select(Bookings).where(Bookings.time_slot_id == booking.time_slot_id)
-    )
-    existing_booking = existing_booking_result.scalar_one_or_none()
-    if existing_booking:
-        raise TimeSlotAlreadyBookedException(booking.time_slot_id)
-    
     try:
-        # Create the booking
-        booking_data = booking.model_dump()
-        booking_data["created_by"] = user_id
+        result = await db.execute(_claim_and_book_stmt([booking.time_slot_id], user_id))
+        row = result.mappings().one_or_none()
 
-        db_booking = Bookings(**booking_data)
-        db.add(db_booking)
-        
-        # Update event status to BOOKED
-        update_result = await db.execute(
-            update(Events)
-            .where(Events.id == booking.time_slot_id)
-            .values(status="BOOKED")
-        )
-        
-        if update_result.rowcount == 0:
-            raise TimeSlotNotFoundException(booking.time_slot_id)
-        
+        if row is None:
+            await db.rollback()
+            conflicts = await _booking_conflicts(db, [booking.time_slot_id])
+            raise conflicts.get(booking.time_slot_id, TimeSlotAlreadyBookedException(booking.time_slot_id))
+
+        db_booking, category_id = _split_category(row)
         await db.commit()
-        await db.refresh(db_booking)
-        
+        await bump_data_versions(db, EVENTS_DATASET)
+        await slot_event_hub.publish([
+            slot_delta(BOOKED, booking.time_slot_id, category_id, "BOOKED", user_id=user_id)
+        ])
         return db_booking
         
     except IntegrityError as e:
         await db.rollback()
+        if "foreign" in str(e).lower() and "created_by" in str(e).lower():
+            raise UserNotFoundException(user_id)
         raise TimeSlotAlreadyBookedException(booking.time_slot_id)
 
+@handle_db_errors("create_bookings_batch_query")
+async def create_bookings_batch_query(db: AsyncSession, batch: BookingsBatchCreate, user_id: int):
+    """
+    Reserve several slots all-or-nothing in one transaction.
+
+    On success every slot is reported as booked. On failure nothing is booked and
+    the exception of the first failing slot is raised (same type and status code as
+    the single-slot path), with the per-slot outcome attached under details["results"].
+    """
+    time_slot_ids = batch.time_slot_ids
+
+    if not time_slot_ids:
+        raise ValidationException("At least one time slot ID is required", "time_slot_ids")
+
+    if len(time_slot_ids) > settings.BOOKING_BATCH_MAX_SIZE:
+        raise ValidationException(f"Cannot reserve more than {settings.BOOKING_BATCH_MAX_SIZE} slots at once", "time_slot_ids")
+
+    if any(not time_slot_id or time_slot_id <= 0 for time_slot_id in time_slot_ids):
+        raise ValidationException("Valid time slot IDs are required", "time_slot_ids")
+
+    if len(set(time_slot_ids)) != len(time_slot_ids):
+        raise ValidationException("Duplicate time slot IDs are not allowed", "time_slot_ids")
+
+    if not user_id or user_id <= 0:
+        raise ValidationException("Valid user ID is required", "user_id")
+
+    try:
+        result = await db.execute(_claim_and_book_stmt(time_slot_ids, user_id))
+        bookings, categories = {}, {}
+        for row in result.mappings().all():
+            booking, categories[row["time_slot_id"]] = _split_category(row)
+            bookings[row["time_slot_id"]] = booking
+
+        if len(bookings) != len(time_slot_ids):
+            await db.rollback()
+            conflicts = await _booking_conflicts(db, time_slot_ids)
+            _raise_batch_failure(time_slot_ids, conflicts)
+
+        await db.commit()
+        await bump_data_versions(db, EVENTS_DATASET)
+        await slot_event_hub.publish(
+            slot_delta(BOOKED, time_slot_id, categories[time_slot_id], "BOOKED", user_id=user_id)
+            for time_slot_id in time_slot_ids
+        )
+
+    except IntegrityError as e:
+        await db.rollback()
+        if "foreign" in str(e).lower() and "created_by" in str(e).lower():
+            raise UserNotFoundException(user_id)
+        conflicts = await _booking_conflicts(db, time_slot_ids)
+        _raise_batch_failure(time_slot_ids, conflicts)
+
+    return {
+        "data": [
+            {"time_slot_id": time_slot_id, "status": "booked", "booking": bookings[time_slot_id]}
+            for time_slot_id in time_slot_ids
+        ],
+        "user_id": user_id
+    }
+
+def _raise_batch_failure(time_slot_ids: list, conflicts: dict):
+    # A slot may have been freed again between the claim and the diagnosis
+    if not conflicts:
+        conflicts = {time_slot_ids[0]: TimeSlotAlreadyBookedException(time_slot_ids[0])}
+
+    results = []
+    for time_slot_id in time_slot_ids:
+        conflict = conflicts.get(time_slot_id)
+        if conflict is None:
+            results.append({"time_slot_id": time_slot_id, "status": "available"})
+        else:
+            results.append({
+                "time_slot_id": time_slot_id,
+                "status": "failed",
+                "status_code": conflict.status_code,
+                "message": conflict.message
+            })
+
+    first_failure = conflicts[next(i for i in time_slot_ids if i in conflicts)]
+    first_failure.details["results"] = results
+    raise first_failure
+
 @handle_db_errors("get_bookings_by_user_query")
 async def get_bookings_by_user_query(db: AsyncSession, user_id: int):
     
@@ -211,6 +329,8 @@ async def cancel_booking_query(db: AsyncSession, event_id: int, user_id: int):
             raise TimeSlotNotFoundException(event_id)
         
         await db.commit()
+        await bump_data_versions(db, EVENTS_DATASET)
+        await slot_event_hub.publish([slot_delta(CANCELLED, event_id, event.category_id, "NOT_BOOKED")])
 
         return {
             "message": "Booking cancelled successfully",
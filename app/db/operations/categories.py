@@ -2,18 +2,55 @@ from datetime import datetime
 from fastapi.exceptions import ValidationException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, delete, func, update
-from sqlalchemy.orm import aliased
+from sqlalchemy import case, delete, func, update
 from sqlalchemy.exc import IntegrityError
 
+from app.core.cache import LRUCache
+from app.core.config import get_settings
 from app.core.error_utils import handle_db_errors
+from app.core.single_flight import single_flight
+from app.core.streaming import stream_partitions
+from app.db.models.data_versions import CATEGORIES_DATASET, EVENTS_DATASET
+from app.db.operations.data_versions import bump_data_versions
 from app.db.models.categories import Category
 from app.db.models.events import Events
 from app.db.models.user import User
 from app.exceptions.booking_exceptions import UserNotFoundException
+from app.exceptions.event_exceptions import VersionConflictException
 from app.exceptions.category_exceptions import CategoryAlreadyExistsException, CategoryCreationException, CategoryHasEventException, CategoryNotFoundException, CategoryUpdateException
 from app.schemas.categories import CategoryCreate, CategoryUpdate
 
+settings = get_settings()
+
+# Read-through cache for category reads; swap in a shared CacheBackend for multi-worker deployments.
+# Entries are stored as (data_version, value) and a different version is a miss, so
+# a list cached by a reader that raced a write, or cached by another worker before
+# it saw the write, is never served under the newer ETag.
+category_cache = LRUCache(
+    max_size=settings.CATEGORY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CATEGORY_CACHE_TTL_SECONDS
+)
+CATEGORY_LIST_CACHE_KEY = "categories:list"
+
+def _category_cache_key(category_id: int) -> str:
+    return f"categories:{category_id}"
+
+async def _cache_get(key: str, data_version: int):
+    if data_version is None:
+        return None
+    cached = await category_cache.get(key)
+    if cached is None or cached[0] != data_version:
+        return None
+    return cached[1]
+
+async def _cache_set(key: str, data_version: int, value):
+    if data_version is not None:
+        await category_cache.set(key, (data_version, value))
+
+async def invalidate_category_cache(*category_ids: int):
+    """Drop the cached category list and, if given, the cached single categories."""
+    await category_cache.delete(CATEGORY_LIST_CACHE_KEY, *(_category_cache_key(i) for i in category_ids))
+
 @handle_db_errors("create_category_query")
 async def create_category_query(db: AsyncSession, category: CategoryCreate, user_id: int):
    
@@ -50,7 +87,9 @@ async def create_category_query(db: AsyncSession, category: CategoryCreate, user
         db_category = Category(**category_data)
         db.add(db_category)
         await db.commit()
+        await bump_data_versions(db, CATEGORIES_DATASET)
         await db.refresh(db_category)
+        await invalidate_category_cache()
         return db_category
     except IntegrityError as e:
         await db.rollback()
@@ -62,36 +101,68 @@ async def create_category_query(db: AsyncSession, category: CategoryCreate, user
         else:
             raise CategoryCreationException(f"Database constraint violation: {str(e)}")
 
-@handle_db_errors("get_categories_query")
-async def get_categories_query(db: AsyncSession):
-    category = aliased(Category)
-    event = aliased(Events)
-    result = await db.execute(  select(
-            category.id,
-            category.category_name,
-            category.color,
-            category.created_by.label("user_id"),
-            func.count(event.id).label("event_count")
+def _categories_select():
+    return (
+        select(
+            Category.id,
+            Category.category_name,
+            Category.color,
+            Category.created_by.label("user_id"),
+            Category.event_count,
+            Category.version
         )
-        .outerjoin(event, event.category_id == category.id)
-        .group_by(category.id)
-        .order_by(category.created_at.desc()))
+        .order_by(Category.created_at.desc())
+    )
+
+@single_flight("get_categories_query")
+@handle_db_errors("get_categories_query")
+async def get_categories_query(db: AsyncSession, data_version: int = None):
+    """
+    Return all categories, served from the cache when possible.
+
+    `data_version` is the categories dataset version the caller read: only a list
+    cached at that version is served, and callers that read a newer version than
+    an in-flight query never join it. Without it the cache is bypassed.
+    """
+    cached = await _cache_get(CATEGORY_LIST_CACHE_KEY, data_version)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(_categories_select())
     categories = [
         {
             "id": row.id,
             "category_name": row.category_name,
             "color": row.color,
             "user_id": row.user_id,
-            "event_count": row.event_count
+            "event_count": row.event_count,
+            "version": row.version
         }
         for row in result.all()
     ]
-    return {"data": categories}
+    response = {"data": categories}
+    await _cache_set(CATEGORY_LIST_CACHE_KEY, data_version, response)
+    return response
+
+def stream_categories_query(db: AsyncSession):
+    """Yield partitions of category rows from a server-side cursor."""
+    return stream_partitions(db, _categories_select())
 
 @handle_db_errors("get_category_by_id_query")
-async def get_category_by_id_query(db: AsyncSession, category_id: int):
+async def get_category_by_id_query(db: AsyncSession, category_id: int, data_version: int = None):
+    cache_key = _category_cache_key(category_id)
+    cached = await _cache_get(cache_key, data_version)
+    if cached is not None:
+        return cached
+
     result = await db.execute(select(Category).where(Category.id == category_id))
-    return result.scalars().first()
+    db_category = result.scalars().first()
+    if db_category is None:
+        return None
+
+    category = {column.name: getattr(db_category, column.name) for column in Category.__table__.columns}
+    await _cache_set(cache_key, data_version, category)
+    return category
 
 @handle_db_errors("update_category_query")
 async def update_category_query(db: AsyncSession, category: CategoryUpdate):
@@ -110,15 +181,6 @@ async def update_category_query(db: AsyncSession, category: CategoryUpdate):
         
         normalized_name = category.category_name.strip().title()
 
-        existing_category_result = await db.execute(select(Category).where(
-            and_(
-                func.lower(Category.category_name) == func.lower(normalized_name),
-                Category.id != category.id
-            )
-        ))
-        if existing_category_result.scalar_one_or_none():
-            raise CategoryAlreadyExistsException(normalized_name)
-        
     try: 
         update_data = {}
         if category.category_name is not None:
@@ -130,21 +192,35 @@ async def update_category_query(db: AsyncSession, category: CategoryUpdate):
 
         if not update_data:
             raise ValidationException("No fields to update provided")
-        
+
+        # Duplicate names are rejected by uq_category_lower_category_name in this
+        # same statement; a stale version matches no row.
+        query = update(Category).where(Category.id == category.id)
+        if category.version is not None:
+            query = query.where(Category.version == category.version)
         result = await db.execute(
-            update(Category)
-            .where(Category.id == category.id)
-            .values(**update_data)
+            query
+            .values(**update_data, version=Category.version + 1)
+            .returning(Category.version)
         )
-        
-        if result.rowcount == 0:
-            raise CategoryNotFoundException(category.id)
+        new_version = result.scalar_one_or_none()
+
+        if new_version is None:
+            current_version = (await db.execute(
+                select(Category.version).where(Category.id == category.id)
+            )).scalar_one_or_none()
+            if current_version is None:
+                raise CategoryNotFoundException(category.id)
+            raise VersionConflictException("category", category.id, category.version, current_version)
         
         await db.commit()
+        await bump_data_versions(db, CATEGORIES_DATASET, EVENTS_DATASET)
+        await invalidate_category_cache(category.id)
 
         return {
             "message": "Category updated successfully",
             "category_id": category.id,
+            "version": new_version,
         }
     except IntegrityError as e:
         await db.rollback()
@@ -160,23 +236,71 @@ async def delete_category_by_id_query(db: AsyncSession, category_id: int):
     if not category_id or category_id <= 0:
         raise ValidationException("Valid category ID is required", "category_id")
     
-    event_count_result = await db.execute(
-        select(func.count(Events.id)).where(Events.category_id == category_id)
-    )
-    event_count = event_count_result.scalar()
-    if event_count > 0:
-        raise CategoryHasEventException(category_id, event_count)
     try:
-        result = await db.execute(delete(Category).where(Category.id == category_id))
+        result = await db.execute(
+            delete(Category).where(Category.id == category_id, Category.event_count == 0)
+        )
         
         if result.rowcount == 0:
-            raise CategoryNotFoundException(category_id)
+            event_count_result = await db.execute(
+                select(Category.event_count).where(Category.id == category_id)
+            )
+            event_count = event_count_result.scalar_one_or_none()
+            if event_count is None:
+                raise CategoryNotFoundException(category_id)
+            raise CategoryHasEventException(category_id, event_count)
         
         await db.commit()
+        await bump_data_versions(db, CATEGORIES_DATASET)
+        await invalidate_category_cache(category_id)
         return {"data": {"message": "Category deleted successfully", "category_id": category_id}}
     except IntegrityError as e:
         await db.rollback()
         if 'foreign' in str(e).lower():
-            raise CategoryNotFoundException(category_id)
+            # event_count drifted to 0 while events still reference the category
+            event_count_result = await db.execute(
+                select(func.count(Events.id)).where(Events.category_id == category_id)
+            )
+            raise CategoryHasEventException(category_id, event_count_result.scalar_one())
         else:
-            raise CategoryUpdateException(f"Database constraint violation: {str(e)}")
\ No newline at end of file
+            raise CategoryUpdateException(f"Database constraint violation: {str(e)}")
+
+async def adjust_category_event_counts(db: AsyncSession, deltas: dict):
+    """
+    Apply per-category event_count deltas ({category_id: delta}) in one UPDATE.
+
+    Must be called inside the transaction of the event write it accounts for.
+    """
+    deltas = {category_id: delta for category_id, delta in deltas.items() if category_id and delta}
+    if not deltas:
+        return
+    await db.execute(
+        update(Category)
+        .where(Category.id.in_(list(deltas)))
+        .values(event_count=Category.event_count + case(deltas, value=Category.id, else_=0))
+    )
+
+@handle_db_errors("reconcile_category_event_counts_query")
+async def reconcile_category_event_counts_query(db: AsyncSession):
+    """Recompute event_count from the events table and repair every category that drifted."""
+    actual_counts = (
+        select(Category.id.label("category_id"), func.count(Events.id).label("event_count"))
+        .outerjoin(Events, Events.category_id == Category.id)
+        .group_by(Category.id)
+        .subquery()
+    )
+    result = await db.execute(
+        update(Category)
+        .where(
+            Category.id == actual_counts.c.category_id,
+            Category.event_count != actual_counts.c.event_count
+        )
+        .values(event_count=actual_counts.c.event_count)
+        .returning(Category.id, Category.event_count)
+    )
+    repaired = [{"category_id": row.id, "event_count": row.event_count} for row in result.all()]
+    await db.commit()
+    if repaired:
+        await bump_data_versions(db, CATEGORIES_DATASET)
+        await invalidate_category_cache(*(row["category_id"] for row in repaired))
+    return {"data": repaired}
\ No newline at end of file
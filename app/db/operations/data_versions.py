@@ -0,0 +1,43 @@
+import logging
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.error_utils import handle_db_errors
+from app.db.models.data_versions import DataVersion
+
+logger = logging.getLogger(__name__)
+
+async def bump_data_versions(db: AsyncSession, *datasets: str):
+    """
+    Increment the version stamp of each dataset.
+
+    Call after the write it describes has committed: the bump runs and commits in
+    its own short transaction, so writers only hold the data_versions row lock for
+    that long instead of for their whole write. A version that briefly lags the
+    data is safe; one ahead of it is not. A failed
+    bump is logged rather than raised, since the write itself already succeeded.
+    """
+    try:
+        # Fixed order so concurrent bumps of several datasets cannot deadlock
+        for dataset in sorted(datasets):
+            stmt = insert(DataVersion).values(dataset=dataset, version=1)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[DataVersion.dataset],
+                    set_={"version": DataVersion.version + 1}
+                )
+            )
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("Failed to bump data versions %s: %s", ", ".join(datasets), e)
+
+# Not coalesced: each caller must see its own committed writes. Its result is
+# passed to the coalesced list queries as part of their single-flight key.
+@handle_db_errors("get_data_version_query")
+async def get_data_version_query(db: AsyncSession, dataset: str) -> int:
+    result = await db.execute(select(DataVersion.version).where(DataVersion.dataset == dataset))
+    return result.scalar_one_or_none() or 0
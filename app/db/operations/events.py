@@ -1,21 +1,33 @@
-from datetime import datetime
-from sqlalchemy import case, delete, null, update, func
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import case, delete, insert, null, tuple_, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import aliased
 from sqlalchemy.exc import IntegrityError
 
 from app.db.models.events import Events
-from app.schemas.events import EventsCreate, EventsUpdate
+from app.schemas.events import EventRecurrence, EventsBulkCreate, EventsCreate, EventsUpdate
 from app.db.models.bookings import Bookings
 from app.db.models.categories import Category
 from app.db.models.user import User
 from app.exceptions.event_exceptions import (
     EventNotFoundException,
     EventHasBookingsException,
-    ValidationException
+    ValidationException,
+    VersionConflictException
 )
+from app.core.config import get_settings
 from app.core.error_utils import handle_db_errors
+from app.core.single_flight import single_flight
+from app.core.slot_events import CREATED, DELETED, UPDATED, slot_delta, slot_event_hub
+from app.db.models.data_versions import CATEGORIES_DATASET, EVENTS_DATASET
+from app.db.operations.categories import adjust_category_event_counts, invalidate_category_cache
+from app.db.operations.data_versions import bump_data_versions
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.streaming import stream_partitions
+
+settings = get_settings()
 
 @handle_db_errors("create_event_query")
 async def create_event_query(db: AsyncSession, event: EventsCreate, user_id: int):
@@ -37,8 +49,15 @@ async def create_event_query(db: AsyncSession, event: EventsCreate, user_id: int
         db_event = Events(**event_data)
         
         db.add(db_event)
+        await adjust_category_event_counts(db, {event.category_id: 1})
         await db.commit()
+        await bump_data_versions(db, EVENTS_DATASET, CATEGORIES_DATASET)
         await db.refresh(db_event)
+        await invalidate_category_cache(event.category_id)
+        await slot_event_hub.publish([slot_delta(
+            CREATED, db_event.id, db_event.category_id, db_event.status,
+            event_name=db_event.event_name, start_time=db_event.start_time, end_time=db_event.end_time
+        )])
         
         return db_event
         
@@ -46,6 +65,105 @@ async def create_event_query(db: AsyncSession, event: EventsCreate, user_id: int
         await db.rollback()
         raise ValidationException("Data integrity constraint violation")
 
+def _expand_recurrence(rule: EventRecurrence) -> list:
+    """Expand a recurrence rule into event rows, one per slot on each selected weekday."""
+    if rule.slot_minutes <= 0:
+        raise ValidationException("Slot length must be positive", "slot_minutes")
+    if rule.end <= rule.start or rule.end.time() <= rule.start.time():
+        raise ValidationException("Recurrence end must be after start, on the date and the time of day", "end")
+    if any(day < 0 or day > 6 for day in rule.weekdays):
+        raise ValidationException("Weekdays must be between 0 (Monday) and 6 (Sunday)", "weekdays")
+
+    slot = timedelta(minutes=rule.slot_minutes)
+    weekdays = set(rule.weekdays)
+    rows = []
+    day = rule.start.date()
+    while day <= rule.end.date():
+        if day.weekday() in weekdays:
+            slot_start = datetime.combine(day, rule.start.time())
+            day_end = datetime.combine(day, rule.end.time())
+            while slot_start + slot <= day_end:
+                rows.append({
+                    "event_name": rule.event_name,
+                    "description": rule.description,
+                    "start_time": slot_start,
+                    "end_time": slot_start + slot,
+                    "status": rule.status,
+                    "category_id": rule.category_id
+                })
+                if len(rows) > settings.EVENT_BULK_MAX_SIZE:
+                    raise ValidationException(f"Cannot create more than {settings.EVENT_BULK_MAX_SIZE} events at once", "recurrence")
+                slot_start += slot
+        day += timedelta(days=1)
+    return rows
+
+@handle_db_errors("create_events_bulk_query")
+async def create_events_bulk_query(db: AsyncSession, bulk: EventsBulkCreate, user_id: int):
+    """Create many events with one multi-row INSERT ... RETURNING, validating references once per batch."""
+    if (bulk.events is None) == (bulk.recurrence is None):
+        raise ValidationException("Provide either a list of events or a recurrence rule", "events")
+
+    if bulk.events is not None:
+        rows = [
+            event.model_dump(include={"event_name", "description", "start_time", "end_time", "status", "category_id"})
+            for event in bulk.events
+        ]
+    else:
+        rows = _expand_recurrence(bulk.recurrence)
+
+    if not rows:
+        raise ValidationException("No events to create", "events")
+    if len(rows) > settings.EVENT_BULK_MAX_SIZE:
+        raise ValidationException(f"Cannot create more than {settings.EVENT_BULK_MAX_SIZE} events at once", "events")
+
+    user_result = await db.execute(select(User.id).where(User.id == user_id))
+    if not user_result.scalar_one_or_none():
+        raise ValidationException("Invalid user ID", "user_id")
+
+    category_counts = Counter(row["category_id"] for row in rows)
+    category_result = await db.execute(select(Category.id).where(Category.id.in_(list(category_counts))))
+    if len(category_result.scalars().all()) != len(category_counts):
+        raise ValidationException("Invalid category ID", "category_id")
+
+    now = datetime.now()
+    for row in rows:
+        row.update({"created_by": user_id, "created_at": now, "modified_at": now})
+
+    try:
+        result = await db.execute(
+            insert(Events)
+            .values(rows)
+            .returning(
+                Events.id,
+                Events.event_name,
+                Events.description,
+                Events.start_time,
+                Events.end_time,
+                Events.status,
+                Events.category_id,
+                Events.created_by
+            )
+        )
+        created = result.mappings().all()
+
+        await adjust_category_event_counts(db, dict(category_counts))
+        await db.commit()
+        await bump_data_versions(db, EVENTS_DATASET, CATEGORIES_DATASET)
+        await invalidate_category_cache(*category_counts)
+        await slot_event_hub.publish(
+            slot_delta(
+                CREATED, row["id"], row["category_id"], row["status"],
+                event_name=row["event_name"], start_time=row["start_time"], end_time=row["end_time"]
+            )
+            for row in created
+        )
+
+        return {"data": created, "count": len(created)}
+
+    except IntegrityError:
+        await db.rollback()
+        raise ValidationException("Data integrity constraint violation")
+
 @handle_db_errors("get_event_by_id_query")
 async def get_event_by_id_query(db: AsyncSession, event_id: int):
     if event_id <= 0:
@@ -59,13 +177,18 @@ async def get_event_by_id_query(db: AsyncSession, event_id: int):
     
     return event
 
-@handle_db_errors("get_events_query")
-async def get_events_query(db: AsyncSession):
+def _events_select(
+    position=None,
+    start_from: datetime = None,
+    start_to: datetime = None,
+    category_id: int = None,
+    status: str = None
+):
     slots = aliased(Bookings)
     category = aliased(Category)
     event = Events
 
-    result = await db.execute(
+    query = (
         select(
             event.status,
             case(
@@ -77,14 +200,73 @@ async def get_events_query(db: AsyncSession):
             event.event_name,
             event.start_time,
             event.end_time,
-            event.description
+            event.description,
+            event.version
         )
         .select_from(event)
         .outerjoin(slots, event.id == slots.time_slot_id)
         .outerjoin(category, event.category_id == category.id)
     )
-    
-    return {"data": result.mappings().all()}
+
+    if position is not None:
+        query = query.where(tuple_(event.start_time, event.id) > tuple_(*position))
+    if start_from is not None:
+        query = query.where(event.start_time >= start_from)
+    if start_to is not None:
+        query = query.where(event.start_time < start_to)
+    if category_id is not None:
+        query = query.where(event.category_id == category_id)
+    if status is not None:
+        query = query.where(event.status == status)
+
+    return query.order_by(event.start_time, event.id)
+
+@single_flight("get_events_query")
+@handle_db_errors("get_events_query")
+async def get_events_query(
+    db: AsyncSession,
+    limit: int = None,
+    cursor: str = None,
+    start_from: datetime = None,
+    start_to: datetime = None,
+    category_id: int = None,
+    status: str = None,
+    data_version: int = None
+):
+    """
+    Return one keyset page of events ordered by (start_time, id) plus the next cursor.
+
+    `data_version` is only part of the single-flight key: callers that read a newer
+    version than an in-flight query never join it.
+    """
+    limit = limit or settings.EVENTS_PAGE_SIZE
+    if limit <= 0 or limit > settings.EVENTS_PAGE_MAX_SIZE:
+        raise ValidationException(f"limit must be between 1 and {settings.EVENTS_PAGE_MAX_SIZE}", "limit")
+    position = decode_cursor(cursor)
+
+    result = await db.execute(
+        _events_select(position, start_from, start_to, category_id, status).limit(limit + 1)
+    )
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["start_time"], rows[-1]["id"])
+
+    return {"data": rows, "next_cursor": next_cursor}
+
+def stream_events_query(
+    db: AsyncSession,
+    cursor: str = None,
+    start_from: datetime = None,
+    start_to: datetime = None,
+    category_id: int = None,
+    status: str = None
+):
+    """Yield partitions of event rows from a server-side cursor, in keyset order."""
+    query = _events_select(decode_cursor(cursor), start_from, start_to, category_id, status)
+    return stream_partitions(db, query)
 
 @handle_db_errors("update_event_query")
 async def update_event_query(db: AsyncSession, event: EventsUpdate):
@@ -115,18 +297,50 @@ async def update_event_query(db: AsyncSession, event: EventsUpdate):
     
     update_data['modified_at'] = datetime.now()
 
+    # One statement: lock the row (re-checking the version against the latest
+    # committed row), update it and report the category it is moving away from
+    previous = select(Events.id, Events.category_id).where(Events.id == event.id)
+    if event.version is not None:
+        previous = previous.where(Events.version == event.version)
+    previous = previous.with_for_update().cte("previous")
     result = await db.execute(
         update(Events)
-        .where(Events.id == event.id)
-        .values(**update_data)
+        .where(Events.id == previous.c.id)
+        .values(**update_data, version=Events.version + 1)
+        .returning(
+            Events.version,
+            previous.c.category_id.label("previous_category_id"),
+            Events.category_id,
+            Events.status,
+            Events.event_name,
+            Events.start_time,
+            Events.end_time
+        )
     )
-    
-    if result.rowcount == 0:
-        raise EventNotFoundException(event.id)
+    updated = result.first()
+
+    if updated is None:
+        current_version = (await db.execute(
+            select(Events.version).where(Events.id == event.id)
+        )).scalar_one_or_none()
+        if current_version is None:
+            raise EventNotFoundException(event.id)
+        raise VersionConflictException("event", event.id, event.version, current_version)
+    new_version, previous_category_id = updated.version, updated.previous_category_id
+
+    if "category_id" in update_data and update_data["category_id"] != previous_category_id:
+        await adjust_category_event_counts(db, {previous_category_id: -1, update_data["category_id"]: 1})
     
     await db.commit()
+    await bump_data_versions(db, EVENTS_DATASET, CATEGORIES_DATASET)
+    await invalidate_category_cache(*{previous_category_id, updated.category_id})
+    await slot_event_hub.publish([slot_delta(
+        UPDATED, event.id, updated.category_id, updated.status,
+        previous_category_id=previous_category_id, event_name=updated.event_name,
+        start_time=updated.start_time, end_time=updated.end_time, version=new_version
+    )])
     
-    return {"message": "Event updated successfully", "event_id": event.id}
+    return {"message": "Event updated successfully", "event_id": event.id, "version": new_version}
 
 @handle_db_errors("delete_event_query")
 async def delete_event_query(db: AsyncSession, event_id: int):
@@ -144,11 +358,19 @@ async def delete_event_query(db: AsyncSession, event_id: int):
         raise EventHasBookingsException(event_id, booking_count)
     
     # Delete the event
-    result = await db.execute(delete(Events).where(Events.id == event_id))
+    result = await db.execute(
+        delete(Events).where(Events.id == event_id).returning(Events.category_id)
+    )
+    deleted_category_id = result.scalar_one_or_none()
     
-    if result.rowcount == 0:
+    if deleted_category_id is None:
         raise EventNotFoundException(event_id)
+
+    await adjust_category_event_counts(db, {deleted_category_id: -1})
     
     await db.commit()
+    await bump_data_versions(db, EVENTS_DATASET, CATEGORIES_DATASET)
+    await invalidate_category_cache(deleted_category_id)
+    await slot_event_hub.publish([slot_delta(DELETED, event_id, deleted_category_id)])
     
     return {"message": "Event deleted successfully", "event_id": event_id}
\ No newline at end of file
@@ -4,9 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 
-from app.auth.jwt import create_access_token
-from app.auth.security import hash_password, verify_password
+from app.auth.jwt import create_principal_token
+from app.auth.security import hash_password_async, verify_password_async
 from app.core.error_utils import handle_db_errors
+from app.core.streaming import stream_partitions
 from app.db.models.user import User
 from app.exceptions.booking_exceptions import UserNotFoundException
 from app.exceptions.user_exceptions import AuthenticationException, EmailAlreadyExistsException, EmailNotFoundException
@@ -24,10 +25,7 @@ async def create_user_query(db: AsyncSession, user: UserCreate):
     
     try: 
         user_data = user.model_dump(exclude={"password"})
-        user_data["hashed_password"] = hash_password(user.hashed_password)
-
-        user_data = user.model_dump(exclude={"password"})
-        user_data["hashed_password"] = hash_password(user.hashed_password)
+        user_data["hashed_password"] = await hash_password_async(user.hashed_password)
         db_user = User(**user_data)
         db.add(db_user)
         await db.commit()
@@ -43,6 +41,22 @@ async def get_users_query(db: AsyncSession):
     result = await db.execute(select(User))
     return result.scalars().all()
 
+# Columns safe to stream to any caller of the route; never hashed_password
+USER_STREAM_COLUMNS = (
+    User.id,
+    User.email,
+    User.firstname,
+    User.lastname,
+    User.is_verified,
+    User.is_admin,
+    User.created_at,
+    User.modified_at,
+)
+
+def stream_users_query(db: AsyncSession):
+    """Yield partitions of user rows (USER_STREAM_COLUMNS) from a server-side cursor."""
+    return stream_partitions(db, select(*USER_STREAM_COLUMNS).order_by(User.id))
+
 @handle_db_errors("get_user_query")
 async def get_user_query(db: AsyncSession, user_id: int):
     result = await db.execute(select(User).where(User.id == user_id))
@@ -67,10 +81,10 @@ async def login_user_query(db: AsyncSession, user: LoginRequest):
         db_user = await db.execute(select(User).where(User.email == user.email))
         result = db_user.scalar_one_or_none()
 
-        if not user or not verify_password(user.password, result.hashed_password):
+        if not result or not await verify_password_async(user.password, result.hashed_password):
             raise AuthenticationException("Invalid email or password")
     
-        access_token = create_access_token(data={"sub": result.email})
+        access_token = create_principal_token(result)
         return access_token
 
     except IntegrityError as e:
@@ -0,0 +1,28 @@
+"""
+Repair drift in the denormalized category.event_count column.
+
+Usage:
+    python -m app.db.reconcile_counts
+"""
+import asyncio
+import logging
+
+from app.db.operations.categories import reconcile_category_event_counts_query
+from app.db.session import AsyncSessionLocal, engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        result = await reconcile_category_event_counts_query(session)
+    await engine.dispose()
+
+    repaired = result["data"]
+    if not repaired:
+        logger.info("All category event counts are consistent")
+    for row in repaired:
+        logger.info(f"Repaired category {row['category_id']}: event_count={row['event_count']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
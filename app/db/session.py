@@ -1,10 +1,76 @@
+import time
+from threading import Lock
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
+from app.core.query_stats import instrument_engine
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=True)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_seconds_total": self.total_wait_seconds,
+                "wait_seconds_avg": self.total_wait_seconds / self.checkouts if self.checkouts else 0.0,
+                "wait_seconds_max": self.max_wait_seconds,
+            }
+
+
+database_url = make_url(settings.database_url).update_query_dict(
+    {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+)
+
+engine = create_async_engine(
+    database_url,
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+)
+
+if settings.SQL_QUERY_COUNTING:
+    instrument_engine(engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine, 
@@ -17,3 +83,7 @@ AsyncSessionLocal = sessionmaker(
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+def get_pool_stats() -> dict:
+    """Live connection pool statistics for the application engine."""
+    return engine.sync_engine.pool.stats()
@@ -25,6 +25,51 @@ class EventHasBookingsException(BaseCustomException):
             details={"event_id": event_id, "booking_count": booking_count}
         )
 
+class VersionConflictException(BaseCustomException):
+    def __init__(self, resource: str, resource_id: int, expected_version: int, current_version: int):
+        super().__init__(
+            message=f"{resource.capitalize()} {resource_id} was modified by another request",
+            status_code=status.HTTP_409_CONFLICT,
+            details={
+                "resource": resource,
+                "id": resource_id,
+                "expected_version": expected_version,
+                "current_version": current_version
+            }
+        )
+
+class IdempotencyKeyReusedException(BaseCustomException):
+    def __init__(self, idempotency_key: str):
+        super().__init__(
+            message="Idempotency-Key was already used with a different request",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            details={"idempotency_key": idempotency_key}
+        )
+
+class IdempotencyRequestInProgressException(BaseCustomException):
+    def __init__(self, idempotency_key: str):
+        super().__init__(
+            message="A request with this Idempotency-Key is still being processed",
+            status_code=status.HTTP_409_CONFLICT,
+            details={"idempotency_key": idempotency_key}
+        )
+
+class RateLimitExceededException(BaseCustomException):
+    def __init__(self, group: str, retry_after: int):
+        super().__init__(
+            message="Too many requests",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details={"group": group, "retry_after": retry_after}
+        )
+
+class SlotSubscriberLimitException(BaseCustomException):
+    def __init__(self, max_subscribers: int):
+        super().__init__(
+            message="Too many slot subscriptions on this server, retry shortly",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"max_subscribers": max_subscribers}
+        )
+
 class DatabaseOperationException(BaseCustomException):
     def __init__(self, operation: str, original_error: str):
         super().__init__(
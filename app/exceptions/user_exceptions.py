@@ -41,4 +41,12 @@ class AuthenticationException(BaseCustomException):
             message=message, 
             status_code=status.HTTP_401_UNAUTHORIZED, 
             details={"message": message}
+        )
+
+class PasswordHashingBusyException(BaseCustomException):
+    def __init__(self):
+        super().__init__(
+            message="Too many concurrent authentication requests, please retry shortly",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={}
         )
\ No newline at end of file
@@ -4,8 +4,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import get_settings
 from app.db.init_db import DatabaseInitializer
 from app.routes import router, user_router
-from app.db.models.base import Base
-from app.db.session import AsyncSessionLocal, engine
+from app.db.session import AsyncSessionLocal, engine, get_pool_stats
+from app.auth.security import password_hash_pool
+from app.auth.principal_cache import principal_cache
+from app.core.etag import etag_stats
+from app.core.idempotency import idempotency_store
+from app.core.metrics import registry
+from app.core.responses import FastJSONResponse
+from app.core.middleware import MetricsMiddleware, QueryCountMiddleware, RateLimitMiddleware
+from app.core.rate_limit import rate_limit_store
+from app.core.single_flight import single_flight_group
+from app.core.slot_events import slot_event_hub
+from app.db.operations.categories import category_cache
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from app.exceptions.event_exceptions import BaseCustomException
@@ -19,38 +29,26 @@ from app.exceptions.handlers import (
 settings = get_settings()
 
 async def init_database():
-    try: 
-        print(settings.database_url)
-        db_init = DatabaseInitializer(
-            database_url=settings.database_url,
-            database_name=settings.POSTGRES_DB
-        )
-        await db_init.create_database_if_not_exists()
-
-        await db_init.create_tables()
-
-        async with AsyncSessionLocal() as session:
-            await db_init.add_default_users(session, settings.DEFAULT_USERS)
-
-        print("Database initialized successfully")
-    
-    except Exception as e:
-        print(f"Error initializing database: {str(e)}")
-        raise
+    db_init = DatabaseInitializer(
+        database_url=settings.database_url,
+        database_name=settings.POSTGRES_DB,
+        engine=engine
+    )
+    return await db_init.initialize(AsyncSessionLocal, settings.DEFAULT_USERS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_database()
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await slot_event_hub.start()
     yield
     # Shutdown
-    pass
+    await slot_event_hub.stop()
+    password_hash_pool.shutdown()
 
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # lifespan(app)
 
@@ -61,6 +59,10 @@ origins = [
     "*"
 ]
 
+# Added before CORS so that 429 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -69,6 +71,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.SQL_QUERY_COUNTING:
+    app.add_middleware(QueryCountMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Snapshot stats exported as gauges on /metrics
+registry.register_collector("db_pool", get_pool_stats)
+registry.register_collector("password_hash_pool", password_hash_pool.stats)
+registry.register_collector("principal_cache", principal_cache.stats)
+registry.register_collector("category_cache", category_cache.stats)
+registry.register_collector("idempotency", idempotency_store.stats)
+registry.register_collector("rate_limit", rate_limit_store.stats)
+registry.register_collector("single_flight", single_flight_group.stats)
+registry.register_collector("slot_events", slot_event_hub.stats)
+registry.register_collector("etag", lambda: {
+    f"{dataset}_{key}": value for dataset, counts in etag_stats.stats().items() for key, value in counts.items()
+})
+
 # Exception Handlers
 app.add_exception_handler(BaseCustomException, custom_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.core.metrics import registry
 from app.db.session import get_db
 from app.db.operations.user import create_user_query, login_user_query
 from app.schemas.user import Token, LoginRequest, UserCreate, UserOut
 
+settings = get_settings()
+
 router = APIRouter()
 
 @router.post('/login', response_model=Token)
@@ -14,3 +19,10 @@ async def login(login_req: LoginRequest, db: AsyncSession = Depends(get_db)):
 @router.post("/register/", response_model=UserOut)
 async def create(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     return await create_user_query(db, user_data)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,26 +1,87 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status as http_status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.auth import admin_required, get_current_user
-from app.db.operations.bookings import cancel_booking_query, create_booking_query
-from app.db.operations.events import get_events_query
-from app.schemas.bookings import BookingsCreate
-from app.schemas.user import UserCreate, UserOut
-from app.db.session import get_db
-from app.db.operations.user import create_user_query, get_users_query, get_user_query
+from app.auth.principal_cache import principal_cache
+from app.auth.security import password_hash_pool
+from app.core.idempotency import IDEMPOTENCY_HEADER, idempotency_store, run_idempotent
+from app.core.responses import FastJSONResponse
+from app.core.single_flight import single_flight_group
+from app.core.slot_events import SSE_MEDIA_TYPE, slot_event_hub
+from app.core.etag import etag_stats, is_not_modified, make_etag
+from app.core.streaming import ndjson_response, wants_ndjson
+from app.db.models.data_versions import CATEGORIES_DATASET, EVENTS_DATASET
+from app.db.operations.data_versions import get_data_version_query
+from app.db.operations.bookings import cancel_booking_query, create_booking_query, create_bookings_batch_query
+from app.db.operations.events import get_events_query, stream_events_query
+from app.schemas.bookings import BookingsBatchCreate, BookingsCreate
+from app.schemas.user import CurrentUserOut, UserCreate, UserOut
+from app.db.init_db import last_startup_report
+from app.db.session import get_db, get_pool_stats
+from app.db.operations.user import create_user_query, get_users_query, get_user_query, stream_users_query
 from app.auth.auth import admin_required
-from app.schemas.categories import CategoryCreate, CategoryUpdate
-from app.schemas.events import EventsCreate, EventsUpdate
-from app.db.operations.categories import create_category_query, get_categories_query, delete_category_by_id_query, get_category_by_id_query, update_category_query
-from app.db.operations.events import create_event_query, delete_event_query, update_event_query
+from app.schemas.categories import CategoryCreate, CategoryList, CategoryUpdate
+from app.schemas.events import EventsBulkCreate, EventsCreate, EventsPage, EventsUpdate
+from app.db.operations.categories import create_category_query, get_categories_query, delete_category_by_id_query, get_category_by_id_query, update_category_query, stream_categories_query, category_cache
+from app.db.operations.events import create_event_query, create_events_bulk_query, delete_event_query, update_event_query
 
 router = APIRouter()
 
-@router.get("/me")
+@router.get("/me", response_model=CurrentUserOut)
 async def get_my_info(user=Depends(get_current_user)):
     return user
 
+@router.get("/stats/principal_cache")
+async def read_principal_cache_stats(user=Depends(admin_required)):
+    return principal_cache.stats()
+
+@router.delete("/stats/principal_cache")
+async def invalidate_principal_cache(email: Optional[str] = None, user=Depends(admin_required)):
+    """Evict one user's cached principal (or all of them) in this worker after changing their role or flags."""
+    if email is None:
+        principal_cache.clear()
+    else:
+        principal_cache.invalidate(email)
+    return principal_cache.stats()
+
+@router.get("/stats/password_hashing")
+async def read_password_hashing_stats(user=Depends(admin_required)):
+    return password_hash_pool.stats()
+
+@router.get("/stats/category_cache")
+async def read_category_cache_stats(user=Depends(admin_required)):
+    return category_cache.stats()
+
+@router.get("/stats/idempotency")
+async def read_idempotency_stats(user=Depends(admin_required)):
+    return idempotency_store.stats()
+
+@router.get("/stats/single_flight")
+async def read_single_flight_stats(user=Depends(admin_required)):
+    return single_flight_group.stats()
+
+@router.get("/stats/slot_events")
+async def read_slot_event_stats(user=Depends(admin_required)):
+    return slot_event_hub.stats()
+
+@router.get("/stats/db_pool")
+async def read_db_pool_stats(user=Depends(admin_required)):
+    return get_pool_stats()
+
+@router.get("/stats/startup")
+async def read_startup_stats(user=Depends(admin_required)):
+    return last_startup_report
+
+@router.get("/stats/etag")
+async def read_etag_stats(user=Depends(admin_required)):
+    return etag_stats.stats()
+
 @router.get("/users", response_model=list[UserOut])
-async def read_users(db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+async def read_users(request: Request, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+    if wants_ndjson(request):
+        return ndjson_response(stream_users_query(db))
     return await get_users_query(db)
 
 @router.get("/users/{user_id}", response_model=UserOut)
@@ -28,12 +89,67 @@ async def read_user(user_id: int, db: AsyncSession = Depends(get_db), user=Depen
     return await get_user_query(db, user_id)
 
 @router.post('/reserve_slot')
-async def book_slot(slot: BookingsCreate, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
-    return await create_booking_query(db, slot, user['id'])
-
-@router.get('/all_slots')
-async def read_bookings(db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
-    return await get_events_query(db)
+async def book_slot(
+    slot: BookingsCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    return await run_idempotent(
+        idempotency_key, f"{user['id']}:reserve_slot", slot,
+        lambda: create_booking_query(db, slot, user['id'])
+    )
+
+@router.post('/reserve_slots')
+async def book_slots(
+    slots: BookingsBatchCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    return await run_idempotent(
+        idempotency_key, f"{user['id']}:reserve_slots", slots,
+        lambda: create_bookings_batch_query(db, slots, user['id'])
+    )
+
+@router.get('/all_slots', response_model=EventsPage)
+async def read_bookings(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    if wants_ndjson(request):
+        return ndjson_response(stream_events_query(db, cursor, start_from, start_to, category_id, status))
+    version = await get_data_version_query(db, EVENTS_DATASET)
+    etag = make_etag(EVENTS_DATASET, version)
+    if is_not_modified(request, EVENTS_DATASET, etag):
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    # Pages can be large: render the rows straight to JSON instead of validating
+    # them against EventsPage, which only documents the shape.
+    page = await get_events_query(db, limit, cursor, start_from, start_to, category_id, status, data_version=version)
+    return FastJSONResponse(page, headers={"ETag": etag})
+
+@router.get('/slots/stream')
+async def stream_slot_changes(
+    category_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    """Server-Sent Events feed of slot changes, optionally for one category."""
+    # Release any connection used for authentication; the stream may stay open for hours
+    await db.close()
+    subscription = slot_event_hub.subscribe(category_id)
+    return StreamingResponse(
+        slot_event_hub.stream(subscription),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.delete('/cancel_slot/{event_id}')
 async def cancel_slot(event_id: int, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
@@ -41,16 +157,32 @@ async def cancel_slot(event_id: int, db: AsyncSession = Depends(get_db), user=De
 
 
 @router.post('/categories')
-async def add_category(catgory: CategoryCreate, db: AsyncSession = Depends(get_db),  user=Depends(admin_required)):
-    return await create_category_query(db, catgory, user['id'])
-
-@router.get('/categories')
-async def read_categories(db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
-    return await get_categories_query(db)
-
-@router.get('/categories/{catgory_id}')
+async def add_category(
+    catgory: CategoryCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(admin_required)
+):
+    return await run_idempotent(
+        idempotency_key, f"{user['id']}:categories", catgory,
+        lambda: create_category_query(db, catgory, user['id'])
+    )
+
+@router.get('/categories', response_model=CategoryList)
+async def read_categories(request: Request, response: Response, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+    if wants_ndjson(request):
+        return ndjson_response(stream_categories_query(db))
+    version = await get_data_version_query(db, CATEGORIES_DATASET)
+    etag = make_etag(CATEGORIES_DATASET, version)
+    if is_not_modified(request, CATEGORIES_DATASET, etag):
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return await get_categories_query(db, data_version=version)
+
+@router.get('/categories/{category_id}')
 async def read_categories_by_id(category_id: int, db: AsyncSession = Depends(get_db),  user=Depends(admin_required)):
-    return await get_category_by_id_query(db, category_id)
+    version = await get_data_version_query(db, CATEGORIES_DATASET)
+    return await get_category_by_id_query(db, category_id, data_version=version)
 
 @router.put('/category')
 async def update_category_route(category: CategoryUpdate, db: AsyncSession = Depends(get_db),  user=Depends(admin_required)): 
@@ -61,8 +193,28 @@ async def delete_category(category_id: int, db: AsyncSession = Depends(get_db),
     return await delete_category_by_id_query(db, category_id)
 
 @router.post('/create_event')
-async def add_event(event: EventsCreate, db: AsyncSession = Depends(get_db),  user=Depends(admin_required)):
-    return await create_event_query(db, event, user['id'])
+async def add_event(
+    event: EventsCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(admin_required)
+):
+    return await run_idempotent(
+        idempotency_key, f"{user['id']}:create_event", event,
+        lambda: create_event_query(db, event, user['id'])
+    )
+
+@router.post('/create_events')
+async def add_events(
+    events: EventsBulkCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(admin_required)
+):
+    return await run_idempotent(
+        idempotency_key, f"{user['id']}:create_events", events,
+        lambda: create_events_bulk_query(db, events, user['id'])
+    )
 
 @router.delete('/event/{event_id}')
 async def delete_event_route(event_id: int, db: AsyncSession = Depends(get_db), user=Depends(admin_required)):
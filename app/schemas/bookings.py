@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 class BookingsCreate(BaseModel):
@@ -10,6 +10,9 @@ class BookingsCreate(BaseModel):
     created_at: Optional[datetime] = datetime.now()
     modified_at: Optional[datetime] = datetime.now()
 
+class BookingsBatchCreate(BaseModel):
+    time_slot_ids: List[int]
+
 class BookingOut(BookingsCreate):
     id: int
     
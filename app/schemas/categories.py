@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 class CategoryCreate(BaseModel):
@@ -13,9 +13,22 @@ class CategoryUpdate(BaseModel):
     id: int
     category_name: str
     color: str
+    # Version read by the client; the update fails with 409 if the row has moved on
+    version: Optional[int] = None
 
 class CategoryOut(CategoryCreate):
     id: int
 
     class Config:
         orm_mode = True
+
+class CategoryListItem(BaseModel):
+    id: int
+    category_name: str
+    color: str
+    user_id: int
+    event_count: int
+    version: int
+
+class CategoryList(BaseModel):
+    data: List[CategoryListItem]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 class EventsCreate(BaseModel):
@@ -21,9 +21,41 @@ class EventsUpdate(BaseModel):
     end_time: datetime
     status: str
     category_id: int
+    # Version read by the client; the update fails with 409 if the row has moved on
+    version: Optional[int] = None
+
+class EventRecurrence(BaseModel):
+    """Hourly-style slots every selected weekday between the time-of-day of start and end."""
+    event_name: str
+    description: str
+    category_id: int
+    status: str = "NOT_BOOKED"
+    start: datetime
+    end: datetime
+    slot_minutes: int
+    weekdays: List[int] = [0, 1, 2, 3, 4, 5, 6]  # Monday is 0
+
+class EventsBulkCreate(BaseModel):
+    events: Optional[List[EventsCreate]] = None
+    recurrence: Optional[EventRecurrence] = None
 
 class EventsOut(EventsCreate):
     id: int
 
     class Config:
         orm_mode = True
+
+class EventSlotOut(BaseModel):
+    status: str
+    user_id: Optional[int] = None
+    id: int
+    category_name: Optional[str] = None
+    event_name: str
+    start_time: datetime
+    end_time: datetime
+    description: Optional[str] = None
+    version: int
+
+class EventsPage(BaseModel):
+    data: List[EventSlotOut]
+    next_cursor: Optional[str] = None
@@ -20,6 +20,15 @@ class UserOut(UserCreate):
         orm_mode = True
     
 
+class CurrentUserOut(BaseModel):
+    id: int
+    email: str
+    firstname: Optional[str] = None
+    lastname: Optional[str] = None
+    is_verified: bool
+    is_admin: bool
+
+
 class LoginRequest(BaseModel):
     email: str
     password: str
@@ -0,0 +1,124 @@
+"""
+Batch reservation benchmark.
+
+Reserves N adjacent slots once with N create_booking_query calls (one session
+each, like N HTTP requests) and once with a single create_bookings_batch_query
+call, against the configured Postgres database.
+
+Usage:
+    python -m benchmarks.batch_reservation --slots 20 --rounds 5 --output bench_batch_reservation.json
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app.db.models.bookings import Bookings
+from app.db.models.categories import Category
+from app.db.models.events import Events
+from app.db.models.user import User
+from app.db.operations.bookings import create_booking_query, create_bookings_batch_query
+from app.db.session import AsyncSessionLocal, engine
+from app.schemas.bookings import BookingsBatchCreate, BookingsCreate
+from benchmarks.common import write_results
+
+
+async def seed_slots(admin_id: int, count: int) -> list:
+    now = datetime.now()
+    async with AsyncSessionLocal() as session:
+        category = Category(
+            category_name=f"Bench {now.timestamp()}",
+            color="#000000",
+            created_by=admin_id,
+            created_at=now,
+            modified_at=now,
+        )
+        session.add(category)
+        await session.flush()
+        events = [
+            Events(
+                event_name=f"Batch slot {i}",
+                description="benchmark slot",
+                start_time=now + timedelta(days=1, hours=i),
+                end_time=now + timedelta(days=1, hours=i + 1),
+                status="NOT_BOOKED",
+                category_id=category.id,
+                created_by=admin_id,
+                created_at=now,
+                modified_at=now,
+            )
+            for i in range(count)
+        ]
+        session.add_all(events)
+        await session.commit()
+        return [event.id for event in events]
+
+
+async def cleanup(slot_ids: list):
+    async with AsyncSessionLocal() as session:
+        category_ids = (await session.execute(
+            select(Events.category_id).where(Events.id.in_(slot_ids)).distinct()
+        )).scalars().all()
+        await session.execute(delete(Bookings).where(Bookings.time_slot_id.in_(slot_ids)))
+        await session.execute(delete(Events).where(Events.id.in_(slot_ids)))
+        await session.execute(delete(Category).where(Category.id.in_(category_ids)))
+        await session.commit()
+
+
+async def reserve_individually(slot_ids: list, user_id: int) -> float:
+    start = time.perf_counter()
+    for slot_id in slot_ids:
+        async with AsyncSessionLocal() as session:
+            await create_booking_query(session, BookingsCreate(time_slot_id=slot_id), user_id)
+    return time.perf_counter() - start
+
+
+async def reserve_batch(slot_ids: list, user_id: int) -> float:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        await create_bookings_batch_query(session, BookingsBatchCreate(time_slot_ids=slot_ids), user_id)
+    return time.perf_counter() - start
+
+
+async def main(slots: int, rounds: int, output: str):
+    async with AsyncSessionLocal() as session:
+        users = (await session.execute(select(User.id, User.is_admin))).all()
+    admin_id = next(u.id for u in users if u.is_admin)
+    user_id = next(u.id for u in users if not u.is_admin)
+
+    timings = {"single_calls": [], "batch_call": []}
+    for _ in range(rounds):
+        for mode, reserve in (("single_calls", reserve_individually), ("batch_call", reserve_batch)):
+            slot_ids = await seed_slots(admin_id, slots)
+            try:
+                timings[mode].append(await reserve(slot_ids, user_id))
+            finally:
+                await cleanup(slot_ids)
+
+    results = {
+        "slots": slots,
+        "rounds": rounds,
+        **{
+            mode: {
+                "median_ms": statistics.median(samples) * 1000,
+                "min_ms": min(samples) * 1000,
+                "max_ms": max(samples) * 1000,
+            }
+            for mode, samples in timings.items()
+        },
+    }
+    results["speedup"] = results["single_calls"]["median_ms"] / results["batch_call"]["median_ms"]
+    write_results(results, output)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slots", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+    asyncio.run(main(args.slots, args.rounds, args.output))
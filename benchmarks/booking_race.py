@@ -0,0 +1,126 @@
+"""
+Booking race benchmark.
+
+Many clients race for the same slot through create_booking_query against the
+configured Postgres database. Exactly one reservation must succeed; every other
+client should get TimeSlotAlreadyBookedException. Reports per-call latency and
+outcome counts.
+
+Usage:
+    python -m benchmarks.booking_race --clients 100 --rounds 5 --output bench_booking_race.json
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.db.models.bookings import Bookings
+from app.db.models.categories import Category
+from app.db.models.events import Events
+from app.db.models.user import User
+from app.db.operations.bookings import create_booking_query
+from app.db.session import AsyncSessionLocal, engine
+from app.exceptions.event_exceptions import BaseCustomException
+from app.schemas.bookings import BookingsCreate
+from benchmarks.common import percentile, write_results
+
+settings = get_settings()
+
+
+async def seed_slot(session, admin_id: int) -> int:
+    now = datetime.now()
+    category = Category(
+        category_name=f"Bench {now.timestamp()}",
+        color="#000000",
+        created_by=admin_id,
+        created_at=now,
+        modified_at=now,
+    )
+    session.add(category)
+    await session.flush()
+    event = Events(
+        event_name="Booking race",
+        description="benchmark slot",
+        start_time=now + timedelta(days=1),
+        end_time=now + timedelta(days=1, hours=1),
+        status="NOT_BOOKED",
+        category_id=category.id,
+        created_by=admin_id,
+        created_at=now,
+        modified_at=now,
+    )
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+async def reserve(slot_id: int, user_id: int, latencies, outcomes: Counter):
+    async with AsyncSessionLocal() as session:
+        start = time.perf_counter()
+        try:
+            await create_booking_query(session, BookingsCreate(time_slot_id=slot_id), user_id)
+            outcomes["booked"] += 1
+        except BaseCustomException as e:
+            outcomes[type(e).__name__] += 1
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+
+async def main(clients: int, rounds: int, output: str):
+    async with AsyncSessionLocal() as session:
+        users = (await session.execute(select(User.id, User.is_admin))).all()
+    admin_id = next(u.id for u in users if u.is_admin)
+    user_ids = [u.id for u in users]
+
+    latencies = []
+    outcomes = Counter()
+    slot_ids = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        async with AsyncSessionLocal() as session:
+            slot_id = await seed_slot(session, admin_id)
+        slot_ids.append(slot_id)
+        await asyncio.gather(*(
+            reserve(slot_id, user_ids[i % len(user_ids)], latencies, outcomes)
+            for i in range(clients)
+        ))
+    elapsed = time.perf_counter() - start
+
+    async with AsyncSessionLocal() as session:
+        booked = (await session.execute(
+            select(Bookings.time_slot_id).where(Bookings.time_slot_id.in_(slot_ids))
+        )).all()
+        category_ids = (await session.execute(
+            select(Events.category_id).where(Events.id.in_(slot_ids))
+        )).scalars().all()
+        await session.execute(delete(Bookings).where(Bookings.time_slot_id.in_(slot_ids)))
+        await session.execute(delete(Events).where(Events.id.in_(slot_ids)))
+        await session.execute(delete(Category).where(Category.id.in_(category_ids)))
+        await session.commit()
+
+    results = {
+        "clients": clients,
+        "rounds": rounds,
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": (clients * rounds) / elapsed if elapsed else 0.0,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "outcomes": dict(outcomes),
+        "double_bookings": len(booked) - len({b.time_slot_id for b in booked}),
+    }
+    write_results(results, output)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.rounds, args.output))
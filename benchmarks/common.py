@@ -0,0 +1,15 @@
+import json
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def write_results(results: dict, output: str):
+    print(json.dumps(results, indent=2, default=str))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2, default=str)
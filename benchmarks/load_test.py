@@ -0,0 +1,263 @@
+"""
+End-to-end load test.
+
+Logs in as the DEFAULT_USERS, seeds a category and a block of events through the
+admin API, then drives a workload against every route and reports throughput,
+latency percentiles and error rates per route.
+
+Without --base-url the app runs in-process (ASGI transport, lifespan included)
+against the configured Postgres, e.g. the docker-compose `db` service.
+
+Workloads:
+    mixed       realistic mix of reads, reservations/cancellations and admin writes
+    contention  every virtual user races to reserve the same slot; the winner cancels it again
+
+Usage:
+    python -m benchmarks.load_test --workload mixed --users 50 --duration 30 --output load_mixed.json
+    python -m benchmarks.load_test --workload contention --baseline benchmarks/baselines/load_contention.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.core.config import Settings, get_settings
+from benchmarks.common import percentile, write_results
+
+settings = get_settings()
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.transport_errors = defaultdict(int)
+
+    def record(self, route: str, started: float, status: int = None):
+        self.latencies[route].append(time.perf_counter() - started)
+        if status is None:
+            self.transport_errors[route] += 1
+        else:
+            self.statuses[route][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            statuses = self.statuses[route]
+            errors = self.transport_errors[route] + sum(count for status, count in statuses.items() if status >= 500)
+            routes[route] = {
+                "requests": len(samples),
+                "throughput_per_second": len(samples) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "error_rate": errors / len(samples) if samples else 0.0,
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+        return routes
+
+
+class Client:
+    """One virtual user: an authenticated HTTP client plus shared stats."""
+
+    def __init__(self, http: httpx.AsyncClient, stats: RouteStats, user: dict):
+        self.http = http
+        self.stats = stats
+        self.user = user
+        self.headers = {}
+        self.category_id = None
+
+    async def request(self, route: str, method: str, url: str, headers: dict = None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers={**self.headers, **(headers or {})}, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(route, started)
+            return None
+        self.stats.record(route, started, response.status_code)
+        return response
+
+    async def login(self):
+        response = await self.request(
+            "POST /login", "POST", "/login",
+            json={"email": self.user["email"], "password": self.user["password"]}
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@asynccontextmanager
+async def http_client(base_url: str):
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+            yield http
+        return
+
+    # Every simulated user shares one in-process client address; measure the app, not the limiter.
+    # get_settings() builds a new Settings each call, so switch the class default before app.main reads it.
+    Settings.RATE_LIMIT_ENABLED = False
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30) as http:
+            yield http
+
+
+async def seed(admin: Client, slots: int) -> tuple:
+    name = f"Load {datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    response = await admin.request("POST /categories", "POST", "/categories", json={"category_name": name, "color": "#336699"})
+    response.raise_for_status()
+    category_id = response.json()["id"]
+
+    start = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    response = await admin.request("POST /create_events", "POST", "/create_events", json={"events": [
+        {
+            "event_name": f"Load slot {i}",
+            "description": "load test slot",
+            "start_time": (start + timedelta(minutes=30 * i)).isoformat(),
+            "end_time": (start + timedelta(minutes=30 * (i + 1))).isoformat(),
+            "status": "NOT_BOOKED",
+            "category_id": category_id,
+        }
+        for i in range(slots)
+    ]})
+    response.raise_for_status()
+    return category_id, [event["id"] for event in response.json()["data"]]
+
+
+async def mixed_user(client: Client, admin: Client, slot_ids: list, deadline: float):
+    etag = None
+    while time.perf_counter() < deadline:
+        roll = random.random()
+        if roll < 0.45:
+            headers = {"If-None-Match": etag} if etag else {}
+            response = await client.request("GET /all_slots", "GET", "/all_slots", headers=headers, params={"limit": 100})
+            if response is not None:
+                etag = response.headers.get("etag", etag)
+        elif roll < 0.65:
+            await client.request("GET /categories", "GET", "/categories")
+        elif roll < 0.90:
+            slot_id = random.choice(slot_ids)
+            response = await client.request("POST /reserve_slot", "POST", "/reserve_slot", json={"time_slot_id": slot_id})
+            if response is not None and response.status_code == 200:
+                await client.request("DELETE /cancel_slot/{event_id}", "DELETE", f"/cancel_slot/{slot_id}")
+        else:
+            await admin.request("GET /categories/{category_id}", "GET", f"/categories/{admin.category_id}")
+            await admin.request("GET /users", "GET", "/users")
+            await admin.request("GET /me", "GET", "/me")
+            await admin_write(admin)
+
+
+async def admin_write(admin: Client):
+    start = datetime.now() + timedelta(days=30, minutes=random.randint(0, 10000))
+    response = await admin.request("POST /create_event", "POST", "/create_event", json={
+        "event_name": "Load admin event",
+        "description": "created by load test",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat(),
+        "status": "NOT_BOOKED",
+        "category_id": admin.category_id,
+    })
+    if response is None or response.status_code != 200:
+        return
+    event_id = response.json()["id"]
+    await admin.request("PUT /event", "PUT", "/event", json={
+        "id": event_id,
+        "event_name": "Load admin event (edited)",
+        "description": "updated by load test",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat(),
+        "status": "NOT_BOOKED",
+        "category_id": admin.category_id,
+    })
+    await admin.request("DELETE /event/{event_id}", "DELETE", f"/event/{event_id}")
+
+
+async def contention_user(client: Client, admin: Client, slot_ids: list, deadline: float):
+    slot_id = slot_ids[0]
+    while time.perf_counter() < deadline:
+        response = await client.request("POST /reserve_slot", "POST", "/reserve_slot", json={"time_slot_id": slot_id})
+        if response is not None and response.status_code == 200:
+            await client.request("DELETE /cancel_slot/{event_id}", "DELETE", f"/cancel_slot/{slot_id}")
+
+
+WORKLOADS = {"mixed": mixed_user, "contention": contention_user}
+
+
+def compare_with_baseline(routes: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of p95 latency, throughput or error rate beyond tolerance."""
+    regressions = []
+    for route, current in routes.items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+        if previous["throughput_per_second"] and current["throughput_per_second"] < previous["throughput_per_second"] * (1 - tolerance):
+            regressions.append(f"{route}: throughput {previous['throughput_per_second']:.1f}/s -> {current['throughput_per_second']:.1f}/s")
+        if current["error_rate"] > previous["error_rate"] + tolerance / 10:
+            regressions.append(f"{route}: error rate {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
+
+
+async def main(args):
+    default_users = settings.DEFAULT_USERS
+    admins = [user for user in default_users if user.get("is_admin")]
+    stats = RouteStats()
+
+    async with http_client(args.base_url) as http:
+        admin = Client(http, stats, admins[0])
+        await admin.login()
+        admin.category_id, slot_ids = await seed(admin, args.slots)
+
+        clients = []
+        for i in range(args.users):
+            client = Client(http, stats, default_users[i % len(default_users)])
+            await client.login()
+            clients.append(client)
+
+        stats.__init__()  # measure the workload only, not setup
+        workload = WORKLOADS[args.workload]
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(workload(client, admin, slot_ids, deadline) for client in clients))
+        elapsed = time.perf_counter() - started
+
+    results = {
+        "workload": args.workload,
+        "users": args.users,
+        "duration_seconds": elapsed,
+        "target": args.base_url or "in-process",
+        "timestamp": datetime.now().isoformat(),
+        "routes": stats.report(elapsed),
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results["routes"], json.load(f), args.tolerance)
+        results["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+
+    write_results(results, args.output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="", help="target server; omit to run the app in-process")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--slots", type=int, default=200)
+    parser.add_argument("--output", default="")
+    parser.add_argument("--baseline", default="", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,96 @@
+"""
+Login storm benchmark.
+
+Measures the latency of an unrelated, non-blocking "route" while a burst of
+bcrypt verifications runs, once with the synchronous helpers (blocking the
+event loop, as the handlers used to) and once through the bounded hashing pool.
+
+Both runs must do the same bcrypt work to be comparable, so the storm defaults to
+the pool's capacity (PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE) and the run
+fails if the pool rejects any login.
+
+Usage:
+    python -m benchmarks.login_storm --output bench_login_storm.json
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.auth.security import hash_password, password_hash_pool, verify_password, verify_password_async
+from app.exceptions.user_exceptions import PasswordHashingBusyException
+from benchmarks.common import percentile, write_results
+
+
+async def unrelated_route(latencies, stop: asyncio.Event, interval: float):
+    """Simulates a cheap route: it only needs the loop to be responsive."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append(time.perf_counter() - start - interval)
+
+
+async def login_sync(hashed: str) -> bool:
+    verify_password("password123", hashed)
+    return True
+
+
+async def login_pooled(hashed: str) -> bool:
+    """True when the login was verified, False when the pool turned it away."""
+    try:
+        await verify_password_async("password123", hashed)
+    except PasswordHashingBusyException:
+        return False
+    return True
+
+
+async def run_storm(login, hashed: str, logins: int, interval: float):
+    latencies = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(unrelated_route(latencies, stop, interval))
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    completed = sum(outcomes)
+    return {
+        "logins": logins,
+        "completed": completed,
+        "rejected": logins - completed,
+        "storm_seconds": elapsed,
+        "probe_samples": len(latencies),
+        "probe_p50_ms": percentile(latencies, 0.50) * 1000,
+        "probe_p99_ms": percentile(latencies, 0.99) * 1000,
+        "probe_max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+async def main(logins: int, interval: float, output: str):
+    if logins is None:
+        logins = password_hash_pool.max_workers + password_hash_pool.max_queue
+    hashed = hash_password("password123")
+    results = {
+        "blocking": await run_storm(login_sync, hashed, logins, interval),
+        "pooled": await run_storm(login_pooled, hashed, logins, interval),
+        "pool_stats": password_hash_pool.stats(),
+    }
+    write_results(results, output)
+    password_hash_pool.shutdown()
+
+    rejected = results["pooled"]["rejected"]
+    if rejected:
+        sys.exit(
+            f"{rejected} of {logins} pooled logins were rejected as busy, so the runs did different "
+            f"amounts of work; lower --logins to at most "
+            f"{password_hash_pool.max_workers + password_hash_pool.max_queue} or raise PASSWORD_HASH_MAX_QUEUE"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=None, help="defaults to the hashing pool's capacity")
+    parser.add_argument("--interval", type=float, default=0.001, help="probe interval in seconds")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.interval, args.output))
@@ -0,0 +1,260 @@
+"""
+Micro-benchmarks for the request-path building blocks.
+
+Each benchmark is run for several repeats of N iterations; the result records the
+best and median time per operation so runs can be compared between commits.
+
+Usage:
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.micro --only jwt --baseline micro_main.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.auth.jwt import create_access_token, verify_access_token
+from app.core.error_utils import handle_db_errors
+from app.core.responses import FastJSONResponse
+from app.exceptions.booking_exceptions import TimeSlotAlreadyBookedException
+from app.exceptions.handlers import custom_exception_handler
+from app.schemas.bookings import BookingsCreate
+from app.schemas.events import EventsCreate, EventsPage
+from benchmarks.common import write_results
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, iterations: int):
+    def register(func):
+        BENCHMARKS[name] = (func, iterations)
+        return func
+    return register
+
+
+def all_slots_rows(count: int) -> list:
+    """Build `count` RowMapping objects shaped like an /all_slots page, as the DB driver returns them."""
+    start = datetime(2026, 1, 1, 9, 0)
+    keys = ["status", "user_id", "id", "category_name", "event_name", "start_time", "end_time", "description", "version"]
+    rows = [
+        (
+            "BOOKED" if i % 3 == 0 else "NOT_BOOKED",
+            i % 50 if i % 3 == 0 else None,
+            i,
+            f"Category {i % 20}",
+            f"Event {i}",
+            start + timedelta(minutes=30 * i),
+            start + timedelta(minutes=30 * (i + 1)),
+            "Slot description for the benchmark payload",
+            1,
+        )
+        for i in range(count)
+    ]
+    return IteratorResult(SimpleResultMetaData(keys), iter(rows)).mappings().all()
+
+
+def fake_request(path: str = "/reserve_slot") -> Request:
+    return Request({"type": "http", "method": "POST", "path": path, "headers": [], "query_string": b"",
+                    "server": ("bench", 80), "scheme": "http", "root_path": ""})
+
+
+@benchmark("jwt.create_access_token", 5000)
+def bench_create_access_token():
+    claims = {"sub": "user@example.com", "id": 3, "is_admin": False, "is_verified": True, "cv": 1}
+
+    def run():
+        create_access_token(claims)
+    return run
+
+
+@benchmark("jwt.verify_access_token", 5000)
+def bench_verify_access_token():
+    token = create_access_token({"sub": "user@example.com", "id": 3})["access_token"]
+
+    def run():
+        verify_access_token(token)
+    return run
+
+
+@benchmark("handle_db_errors.raw_call", 50000)
+def bench_raw_operation():
+    session = AsyncSession()
+
+    async def operation(db, value):
+        return value
+
+    return _async_runner(lambda: operation(session, 1))
+
+
+@benchmark("handle_db_errors.wrapped_call", 50000)
+def bench_wrapped_operation():
+    session = AsyncSession()
+
+    @handle_db_errors("bench_operation")
+    async def operation(db, value):
+        return value
+
+    return _async_runner(lambda: operation(session, 1))
+
+
+@benchmark("pydantic.EventsCreate", 20000)
+def bench_events_create():
+    payload = {
+        "event_name": "Standup",
+        "description": "Daily standup",
+        "start_time": "2026-01-01T09:00:00",
+        "end_time": "2026-01-01T09:30:00",
+        "status": "NOT_BOOKED",
+        "category_id": 1,
+    }
+
+    def run():
+        EventsCreate.model_validate(payload)
+    return run
+
+
+@benchmark("pydantic.BookingsCreate", 20000)
+def bench_bookings_create():
+    payload = {"time_slot_id": 42}
+
+    def run():
+        BookingsCreate.model_validate(payload)
+    return run
+
+
+@benchmark("handlers.custom_exception_handler", 5000)
+def bench_error_response():
+    request = fake_request()
+    exc = TimeSlotAlreadyBookedException(42)
+
+    return _async_runner(lambda: custom_exception_handler(request, exc))
+
+
+@benchmark("serialize.all_slots_10k.jsonable_encoder", 5)
+def bench_serialize_jsonable_encoder():
+    payload = {"data": all_slots_rows(10_000), "next_cursor": None}
+
+    def run():
+        # A route returning raw rows with the stock JSONResponse
+        json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode()
+    return run
+
+
+@benchmark("serialize.all_slots_10k.response_model", 5)
+def bench_serialize_response_model():
+    payload = {"data": all_slots_rows(10_000), "next_cursor": None}
+
+    def run():
+        # A route declaring response_model=EventsPage: validate, dump in JSON mode, render
+        page = EventsPage.model_validate({"data": [dict(row) for row in payload["data"]], "next_cursor": None})
+        FastJSONResponse(page.model_dump(mode="json"))
+    return run
+
+
+@benchmark("serialize.all_slots_10k.fast_json_response", 5)
+def bench_serialize_fast_json_response():
+    payload = {"data": all_slots_rows(10_000), "next_cursor": None}
+
+    def run():
+        # What /all_slots does now: render the row mappings directly
+        FastJSONResponse(payload)
+    return run
+
+
+def _async_runner(make_coroutine):
+    """Run the coroutine factory N times inside one event loop turn per repeat."""
+    loop = asyncio.new_event_loop()
+
+    def run_batch(iterations: int):
+        async def batch():
+            for _ in range(iterations):
+                await make_coroutine()
+        loop.run_until_complete(batch())
+
+    run_batch.batched = True
+    return run_batch
+
+
+def measure(func, iterations: int, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        if getattr(func, "batched", False):
+            start = time.perf_counter()
+            func(iterations)
+            timings.append((time.perf_counter() - start) / iterations)
+        else:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            timings.append((time.perf_counter() - start) / iterations)
+    return {
+        "iterations": iterations,
+        "repeats": repeats,
+        "best_us": min(timings) * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "ops_per_second": 1 / min(timings),
+    }
+
+
+def compare_with_baseline(benchmarks: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of median time per operation beyond tolerance."""
+    regressions = []
+    for name, current in benchmarks.items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        if current["median_us"] > previous["median_us"] * (1 + tolerance):
+            regressions.append(f"{name}: {previous['median_us']:.2f}us -> {current['median_us']:.2f}us")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(args) -> int:
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(),
+        "benchmarks": {},
+    }
+    for name, (factory, iterations) in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        iterations = max(1, int(iterations * args.scale))
+        results["benchmarks"][name] = measure(factory(), iterations, args.repeats)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results["benchmarks"], json.load(f), args.tolerance)
+        results["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+
+    write_results(results, args.output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every iteration count")
+    parser.add_argument("--only", default="", help="run benchmarks whose name contains this text")
+    parser.add_argument("--output", default="")
+    parser.add_argument("--baseline", default="", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    sys.exit(main(parser.parse_args()))